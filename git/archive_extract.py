@@ -0,0 +1,95 @@
+import os
+import stat
+import shutil
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+
+def common_prefix(names):
+    # GitHub 的 zipball 所有条目都在 owner-repo-sha/ 这一层目录下
+    first = names[0].split('/', 1)[0] if names else ''
+    if first and all(name == first + '/' or name.startswith(first + '/') for name in names):
+        return first + '/'
+    return ''
+
+
+def safe_target(target_dir, relative_path):
+    # 防止 ../ 或绝对路径把文件写到目标目录之外
+    path = os.path.normpath(os.path.join(target_dir, relative_path))
+    root = os.path.normpath(target_dir)
+    if path != root and not path.startswith(root + os.sep):
+        raise ValueError(f"压缩包中包含非法路径: {relative_path}")
+    return path
+
+
+def extract_zipball(zip_path, target_dir, workers=4, on_progress=None, chunk_size=1 << 20, throttle=None):
+    # 解压时直接去掉外层目录，每个文件只写一次；返回被去掉的外层目录名
+    # throttle(字节数) 在每个文件写完后调用，可用于限制磁盘写入速度
+    with zipfile.ZipFile(zip_path) as archive:
+        members = archive.infolist()
+    prefix = common_prefix([member.filename for member in members])
+
+    files = []
+    for member in members:
+        relative_path = member.filename[len(prefix):]
+        if not relative_path:
+            continue
+        target = safe_target(target_dir, relative_path)
+        if member.is_dir():
+            os.makedirs(target, exist_ok=True)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            files.append((member, target))
+
+    # 每个线程使用自己的 ZipFile 句柄，解压可以并行
+    local = threading.local()
+    handles = []
+    handles_lock = threading.Lock()
+    done = [0]
+    done_lock = threading.Lock()
+
+    def get_archive():
+        if not hasattr(local, 'archive'):
+            local.archive = zipfile.ZipFile(zip_path)
+            with handles_lock:
+                handles.append(local.archive)
+        return local.archive
+
+    def extract_member(item):
+        member, target = item
+        archive = get_archive()
+        mode = member.external_attr >> 16
+        if stat.S_ISLNK(mode):
+            link_target = archive.read(member).decode('utf-8')
+            try:
+                if os.path.lexists(target):
+                    os.remove(target)
+                os.symlink(link_target, target)
+            except (OSError, NotImplementedError):
+                # 不支持符号链接的系统（如未开启开发者模式的 Windows）写成普通文件
+                with open(target, 'w', encoding='utf-8') as file:
+                    file.write(link_target)
+        else:
+            with archive.open(member) as source, open(target, 'wb') as file:
+                shutil.copyfileobj(source, file, chunk_size)
+            if mode & 0o777:
+                os.chmod(target, mode & 0o777)
+        if throttle:
+            throttle(member.file_size)
+
+        if on_progress:
+            with done_lock:
+                done[0] += 1
+                count = done[0]
+            on_progress(count, len(files))
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for _ in executor.map(extract_member, files):
+                pass
+    finally:
+        for archive in handles:
+            archive.close()
+
+    return prefix.rstrip('/')
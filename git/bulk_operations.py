@@ -0,0 +1,137 @@
+import asyncio
+import json
+import aiohttp
+from git.request_scheduler import PRIORITY_NORMAL
+
+# 批量操作：内部名称 -> 显示名称
+OPERATION_NAMES = {
+    'delete': "删除",
+    'archive': "归档",
+    'visibility': "修改可见性",
+    'topics': "设置主题",
+    'create': "创建",
+}
+
+
+class BulkResult:
+    # 单个仓库的执行结果；repo 为操作后的仓库数据（删除时为原仓库），用于就地更新列表
+    def __init__(self, name, ok, message='', repo=None):
+        self.name = name
+        self.ok = ok
+        self.message = message
+        self.repo = repo
+
+
+# 各操作需要的 OAuth 权限，请求据此在同一账号具备权限的 token 之间分配
+OPERATION_SCOPES = {
+    'delete': ('delete_repo',),
+    'archive': ('repo',),
+    'visibility': ('repo',),
+    'topics': ('repo',),
+}
+
+
+class BulkOperationEngine:
+    # 对多个仓库并发执行同一操作，并发数由 worker_count 限制；单个失败不影响其他仓库
+
+    def __init__(self, session, headers, owner, worker_count=4, on_progress=None, priority=PRIORITY_NORMAL):
+        self.session = session
+        self.headers = headers
+        self.owner = owner
+        self.worker_count = max(1, worker_count)
+        self.on_progress = on_progress
+        self.priority = priority
+        self.done = 0
+
+    async def run(self, operation, items, **params):
+        # items：已有仓库的数据（创建时为清单中的条目），返回与 items 顺序一致的 BulkResult 列表
+        handler = getattr(self, operation)
+        semaphore = asyncio.Semaphore(self.worker_count)
+        self.done = 0
+
+        async def run_one(item):
+            async with semaphore:
+                try:
+                    result = await handler(item, **params)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    result = BulkResult(item['name'], False, str(e) or type(e).__name__)
+            self.done += 1
+            if self.on_progress:
+                self.on_progress(self.done, len(items))
+            return result
+
+        return await asyncio.gather(*(run_one(item) for item in items))
+
+    def repo_url(self, repo):
+        # 组织仓库和协作仓库的所有者不是当前用户，优先使用仓库数据中的 full_name
+        full_name = repo.get('full_name')
+        if not full_name:
+            owner = (repo.get('owner') or {}).get('login') or self.owner
+            full_name = f"{owner}/{repo['name']}"
+        return f"https://api.github.com/repos/{full_name}"
+
+    async def send(self, method, url, expected, scopes=(), **kwargs):
+        # 返回 (是否成功, 响应数据或错误信息)
+        async with self.session.request(method, url, headers=self.headers, priority=self.priority,
+                                        scopes=scopes, **kwargs) as response:
+            if response.status != expected:
+                return False, f"状态码 {response.status}: {await response.text()}"
+            if response.status == 204:
+                return True, None
+            return True, await response.json()
+
+    async def delete(self, repo):
+        ok, data = await self.send('DELETE', self.repo_url(repo), 204, scopes=OPERATION_SCOPES['delete'])
+        return BulkResult(repo['name'], ok, "" if ok else data, repo)
+
+    async def archive(self, repo):
+        ok, data = await self.send('PATCH', self.repo_url(repo), 200, scopes=OPERATION_SCOPES['archive'],
+                                   json={"archived": True})
+        return BulkResult(repo['name'], ok, "" if ok else data, data if ok else None)
+
+    async def visibility(self, repo, private):
+        ok, data = await self.send('PATCH', self.repo_url(repo), 200, scopes=OPERATION_SCOPES['visibility'],
+                                   json={"private": private})
+        return BulkResult(repo['name'], ok, "" if ok else data, data if ok else None)
+
+    async def topics(self, repo, names):
+        ok, data = await self.send('PUT', self.repo_url(repo) + '/topics', 200, scopes=OPERATION_SCOPES['topics'],
+                                   json={"names": names})
+        if not ok:
+            return BulkResult(repo['name'], False, data)
+        updated = dict(repo)
+        updated['topics'] = data.get('names', names)
+        return BulkResult(repo['name'], True, "", updated)
+
+    async def create(self, spec):
+        ok, data = await self.send('POST', 'https://api.github.com/user/repos', 201, json=spec)
+        return BulkResult(spec['name'], ok, "" if ok else data, data if ok else None)
+
+
+def load_create_manifest(path):
+    # 清单为 JSON：仓库条目的列表，或 {"repos": [...]}；每个条目至少包含 name，
+    # 其余字段（description、private、auto_init 等）原样传给创建仓库 API
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('repos', [])
+    if not isinstance(data, list):
+        raise ValueError("清单必须是仓库条目的列表")
+    specs = []
+    for entry in data:
+        if isinstance(entry, str):
+            entry = {"name": entry}
+        if not isinstance(entry, dict) or not entry.get('name'):
+            raise ValueError(f"无效的清单条目: {entry}")
+        specs.append(entry)
+    return specs
+
+
+def format_report(operation, results):
+    # 生成逐个仓库的状态报告，失败的排在前面
+    succeeded = [result for result in results if result.ok]
+    failed = [result for result in results if not result.ok]
+    lines = [f"✗ {result.name}: {result.message}" for result in failed]
+    lines += [f"✓ {result.name}" for result in succeeded]
+    summary = f"{OPERATION_NAMES.get(operation, operation)}：成功 {len(succeeded)} 个，失败 {len(failed)} 个"
+    return summary, "\n".join(lines)
@@ -0,0 +1,100 @@
+import os
+import json
+import shutil
+from git.archive_extract import safe_target
+
+# 克隆目录中记录本次克隆对应的提交和文件列表，用于之后的增量更新
+MANIFEST_NAME = '.gitclient-manifest.json'
+
+
+def manifest_path(repo_dir):
+    return os.path.join(repo_dir, MANIFEST_NAME)
+
+
+def load_manifest(repo_dir):
+    try:
+        with open(manifest_path(repo_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_manifest(repo_dir, owner, repo, remote):
+    manifest = {
+        'owner': owner,
+        'repo': repo,
+        'branch': remote['branch'],
+        'commit_sha': remote['head_sha'],
+        'tree_sha': remote['tree_sha'],
+        'complete': remote['complete'],
+        'files': {path: list(entry) for path, entry in (remote['files'] or {}).items()},
+    }
+    tmp_path = manifest_path(repo_dir) + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path(repo_dir))
+    return manifest
+
+
+def diff_files(old_files, new_files):
+    # 返回 (新增或变化的 [(路径, sha, mode)], 已删除的 [路径])
+    changed = []
+    for path, (sha, mode) in new_files.items():
+        old = old_files.get(path)
+        if old is None or tuple(old) != (sha, mode):
+            changed.append((path, sha, mode))
+    removed = [path for path in old_files if path not in new_files]
+    return changed, removed
+
+
+def remove_empty_dirs(repo_dir, paths):
+    # 删除文件后，自下而上清理变空的目录
+    dirs = {os.path.dirname(os.path.join(repo_dir, path)) for path in paths}
+    root = os.path.normpath(repo_dir)
+    for directory in sorted(dirs, key=len, reverse=True):
+        directory = os.path.normpath(directory)
+        while directory != root and directory.startswith(root + os.sep):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break
+            directory = os.path.dirname(directory)
+
+
+def is_inside(repo_dir, path):
+    # 按真实路径判断（会解析符号链接），防止经由仓库中的符号链接写到目录之外
+    root = os.path.realpath(repo_dir)
+    real = os.path.realpath(path)
+    return real == root or real.startswith(root + os.sep)
+
+
+def remove_path(path):
+    # 符号链接只删除链接本身，不跟随
+    if os.path.islink(path) or os.path.isfile(path):
+        os.remove(path)
+    elif os.path.isdir(path):
+        shutil.rmtree(path)
+
+
+def clear_update_targets(repo_dir, changed_paths, removed_paths):
+    # 增量更新写入前调用：先删除远程已删除的路径，再删除类型变化后会挡住新文件的路径
+    # （文件或符号链接变成目录、目录变成文件），否则每次更新都会以同样的方式失败
+    for path in removed_paths:
+        target = safe_target(repo_dir, path)
+        if is_inside(repo_dir, os.path.dirname(target)):
+            remove_path(target)
+    remove_empty_dirs(repo_dir, removed_paths)
+
+    root = os.path.normpath(repo_dir)
+    for path in changed_paths:
+        target = safe_target(repo_dir, path)
+        current = root
+        for part in os.path.relpath(target, root).split(os.sep)[:-1]:
+            current = os.path.join(current, part)
+            if os.path.islink(current) or os.path.isfile(current):
+                os.remove(current)
+                break
+            if not os.path.isdir(current):
+                break
+        if os.path.isdir(target) and not os.path.islink(target):
+            shutil.rmtree(target)
@@ -0,0 +1,117 @@
+import base64
+import hashlib
+from git.request_scheduler import PRIORITY_NORMAL
+
+
+class GitDataError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(f"{status}: {message}" if status else message)
+        self.status = status
+        self.message = message
+        self.headers = headers
+
+
+class GitDataApi:
+    # GitHub Git Data API 的简单封装：blob -> tree -> commit -> ref
+
+    def __init__(self, session, headers, owner, repo, priority=PRIORITY_NORMAL, pooled=False):
+        self.session = session
+        self.headers = headers
+        self.priority = priority
+        self.pooled = pooled  # 公开仓库的只读请求可以使用 token 池
+        self.base_url = f'https://api.github.com/repos/{owner}/{repo}'
+
+    async def request(self, method, path, expected=(200,), **kwargs):
+        pooled = self.pooled and method == 'GET'
+        async with self.session.request(method, self.base_url + path, headers=self.headers,
+                                        priority=self.priority, pooled=pooled, **kwargs) as response:
+            if response.status not in expected:
+                raise GitDataError(response.status, await response.text(), response.headers)
+            if response.status == 204:
+                return None
+            return await response.json()
+
+    async def get_default_branch(self):
+        repo = await self.request('GET', '')
+        return repo.get('default_branch') or 'main'
+
+    async def get_head(self, branch):
+        # 返回 (提交 sha, 树 sha)；空仓库没有分支时 GitHub 返回 404/409
+        ref = await self.request('GET', f'/git/ref/heads/{branch}')
+        commit_sha = ref['object']['sha']
+        commit = await self.request('GET', f'/git/commits/{commit_sha}')
+        return commit_sha, commit['tree']['sha']
+
+    async def get_tree(self, tree_sha, recursive=False):
+        path = f'/git/trees/{tree_sha}'
+        if recursive:
+            path += '?recursive=1'
+        return await self.request('GET', path)
+
+    async def get_blob(self, blob_sha):
+        # 直接取原始内容，省去 base64 解码
+        headers = dict(self.headers)
+        headers['Accept'] = 'application/vnd.github.raw'
+        async with self.session.get(f'{self.base_url}/git/blobs/{blob_sha}', headers=headers,
+                                    priority=self.priority, pooled=self.pooled) as response:
+            if response.status != 200:
+                raise GitDataError(response.status, await response.text(), response.headers)
+            return await response.read()
+
+    async def create_blob(self, content, encoded=None):
+        # encoded 为已经 base64 编码的内容，大文件可在线程池中预先编码，不占用事件循环
+        if encoded is None:
+            encoded = base64.b64encode(content).decode('utf-8')
+        blob = await self.request('POST', '/git/blobs', expected=(201,), json={
+            "content": encoded,
+            "encoding": "base64",
+        })
+        return blob['sha']
+
+    async def create_tree(self, entries, base_tree=None):
+        data = {"tree": entries}
+        if base_tree:
+            data["base_tree"] = base_tree
+        tree = await self.request('POST', '/git/trees', expected=(201,), json=data)
+        return tree['sha']
+
+    async def create_commit(self, message, tree_sha, parents):
+        commit = await self.request('POST', '/git/commits', expected=(201,), json={
+            "message": message,
+            "tree": tree_sha,
+            "parents": parents,
+        })
+        return commit['sha']
+
+    async def update_ref(self, branch, commit_sha):
+        # force=False：只允许快进，分支在此期间被别人推进时会返回 422
+        await self.request('PATCH', f'/git/refs/heads/{branch}', json={
+            "sha": commit_sha,
+            "force": False,
+        })
+
+
+def blob_entry(path, sha, executable=False, mode=None):
+    # mode 指定时优先使用（例如沿用远程文件的模式），否则按 executable 决定
+    return {
+        "path": path,
+        "mode": mode or ("100755" if executable else "100644"),
+        "type": "blob",
+        "sha": sha,
+    }
+
+
+def deletion_entry(path):
+    # base_tree 上 sha 为 null 的条目表示删除该文件
+    return {
+        "path": path,
+        "mode": "100644",
+        "type": "blob",
+        "sha": None,
+    }
+
+
+def git_blob_sha(content):
+    # 与 git hash-object 相同的算法，可直接和远程树里的 sha 比较
+    header = f"blob {len(content)}\0".encode('utf-8')
+    return hashlib.sha1(header + content).hexdigest()
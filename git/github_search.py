@@ -1,17 +1,37 @@
 import asyncio
 import aiohttp
 from PyQt6 import QtWidgets, QtCore, QtGui
-from datetime import datetime
 import re
-import requests
-from bs4 import BeautifulSoup
 from git.search_widget import SearchWidget
+from git.http_cache import http_cache
+from git.search_cache import search_cache
+from git.search_ranker import rank_results
+from git.request_scheduler import PRIORITY_INTERACTIVE
 
 class GitHubSearchWidget(QtWidgets.QWidget):
     search_completed = QtCore.pyqtSignal(list)
+    results_ready = QtCore.pyqtSignal(list)  # 每收到一页就发出其中新出现的仓库
+    search_updated = QtCore.pyqtSignal(list)  # 后台更新缓存后得到的完整新结果
 
-    def __init__(self, parent=None):
+    PER_PAGE = 50
+    MAX_RESULTS = 1000  # GitHub 搜索 API 每个查询最多只能取到前 1000 条
+
+    def __init__(self, parent=None, http_client=None, query_timeout=15, ranking='stars', tasks=None):
         super().__init__(parent)
+        self.http_client = http_client
+        self.tasks = tasks
+        self.futures = []
+        self.ranking = ranking
+        self.search_text = ""
+        self.query_timeout = query_timeout  # 单个查询的超时时间（秒）
+        self.queries = []
+        self.pages = {}  # 查询 -> {'next': 下一页页码（None 表示不再翻页）, 'total': 结果总数}
+        self.page_results = {}  # (查询, 页码) -> 仓库列表
+        self.seen = set()
+        self.all_results = []
+        self.revalidations = []
+        self.loading = False
+        self.active = True
         self.init_ui()
 
     def init_ui(self):
@@ -27,62 +47,182 @@ class GitHubSearchWidget(QtWidgets.QWidget):
     def perform_search(self):
         search_text = self.search_input.text()
         if search_text:
-            asyncio.get_event_loop().call_soon_threadsafe(
-                lambda: asyncio.create_task(self.search_github(search_text))
-            )
+            self.submit(lambda: self.search_github(search_text))
+
+    def load_more(self):
+        # 列表滚动到底部时调用：为每个还有结果的查询加载下一页
+        if not self.loading:
+            self.submit(self.fetch_next_pages)
+
+    def submit(self, factory):
+        self.futures = [future for future in self.futures if not future.done()]
+        self.futures.append(self.tasks.submit(factory, kind='search'))
+
+    def cancel(self):
+        # 开始新的搜索后，旧搜索不再发出任何结果，还在进行的请求也一并取消
+        self.active = False
+        for future in self.futures:
+            future.cancel()
+        self.futures = []
 
     async def search_github(self, search_text):
-        async with aiohttp.ClientSession() as session:
-            exact_matches = await self.search_exact(session, search_text)
-            partial_matches = await self.search_partial(session, search_text)
-            
-            all_results = self.remove_duplicates(exact_matches + partial_matches)
-            sorted_results = self.sort_results(all_results)
-            
-            self.search_completed.emit(sorted_results)
-
-    async def search_exact(self, session, search_text):
-        queries = [
+        self.search_text = search_text
+        self.queries = self.build_queries(search_text)
+        self.pages = {query: {'next': 1, 'total': None} for query in self.queries}
+        self.page_results = {}
+        self.seen = set()
+        self.all_results = []
+        await self.fetch_next_pages()
+        if self.active:
+            self.search_completed.emit(self.sort_results(self.all_results))
+
+    def build_queries(self, search_text):
+        return [
+            # 精确匹配
             f'user:{search_text}',
             f'repo:{search_text}',
             f'"{search_text}" in:name',
             f'"{search_text}" in:description',
-            f'"{search_text}" in:readme'
+            f'"{search_text}" in:readme',
+            # 部分匹配
+            f'{search_text} in:name,description,readme',
         ]
-        results = []
-        for query in queries:
-            results.extend(await self.fetch_results(session, query))
-        return results
-
-    async def search_partial(self, session, search_text):
-        query = f'{search_text} in:name,description,readme'
-        return await self.fetch_results(session, query)
-
-    async def fetch_results(self, session, query):
-        url = f"https://api.github.com/search/repositories?q={query}&sort=stars&order=desc"
-        async with session.get(url) as response:
-            if response.status == 200:
-                data = await response.json()
-                return data['items']
-            else:
-                print(f"GitHub 搜索失败: {response.status}")
-                return []
-
-    def remove_duplicates(self, repos):
+
+    def has_more(self, query):
+        state = self.pages[query]
+        if state['next'] is None:
+            return False
+        if state['total'] is None:
+            return True
+        loaded = (state['next'] - 1) * self.PER_PAGE
+        return loaded < min(state['total'], self.MAX_RESULTS)
+
+    async def fetch_next_pages(self):
+        if self.loading or not self.active:
+            return
+        pending = [query for query in self.queries if self.has_more(query)]
+        if not pending:
+            return
+        self.loading = True
+        tasks = []
+        try:
+            session = await self.http_client.get_session()
+            # 所有查询同时发出，哪个先返回就先显示哪个，慢的或失败的查询不会拖住其他查询
+            tasks = [asyncio.create_task(self.fetch_page_with_timeout(session, query, self.pages[query]['next']))
+                     for query in pending]
+            for finished in asyncio.as_completed(tasks):
+                self.add_page(*await finished)
+        except asyncio.CancelledError:
+            # 搜索被取消（开始了新的搜索）：停止所有还在进行的页面请求和缓存更新，不再占用搜索配额
+            revalidations, self.revalidations = self.revalidations, []
+            await self.cancel_tasks(tasks + revalidations)
+            raise
+        finally:
+            self.loading = False
+        await self.finish_revalidations()
+
+    async def cancel_tasks(self, tasks):
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    def add_page(self, query, page, items, total):
+        state = self.pages[query]
+        if items is None:
+            state['next'] = None  # 请求失败，这个查询不再继续翻页
+            return
+        self.page_results[(query, page)] = items
+        state['total'] = total
+        state['next'] = page + 1 if len(items) >= self.PER_PAGE else None
+
+        new_items = []
+        for repo in items:
+            if repo['id'] not in self.seen:
+                self.seen.add(repo['id'])
+                new_items.append(repo)
+        self.all_results.extend(new_items)
+        if new_items and self.active:
+            self.results_ready.emit(new_items)
+
+    async def finish_revalidations(self):
+        # 使用了过期缓存的页面在后台重新请求，结果有变化时整体刷新一次
+        tasks, self.revalidations = self.revalidations, []
+        try:
+            results = await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            await self.cancel_tasks(tasks)
+            raise
+        changed = False
+        for query, page, items, total in results:
+            if items is not None:
+                self.page_results[(query, page)] = items
+                changed = True
+        search_cache.schedule_save()
+        if changed and self.active:
+            keys = sorted(self.page_results, key=lambda key: (self.queries.index(key[0]), key[1]))
+            self.all_results = self.merge_results(self.page_results[key] for key in keys)
+            self.seen = {repo['id'] for repo in self.all_results}
+            self.search_updated.emit(self.sort_results(self.all_results))
+
+    def merge_results(self, result_lists):
         seen = set()
-        unique_repos = []
-        for repo in repos:
-            if repo['id'] not in seen:
-                seen.add(repo['id'])
-                unique_repos.append(repo)
-        return unique_repos
+        merged = []
+        for items in result_lists:
+            for repo in items:
+                if repo['id'] not in seen:
+                    seen.add(repo['id'])
+                    merged.append(repo)
+        return merged
+
+    async def fetch_page_with_timeout(self, session, query, page):
+        # 返回 (查询, 页码, 仓库列表, 结果总数)；失败时仓库列表为 None
+        try:
+            items, total = await asyncio.wait_for(self.fetch_page(session, query, page), self.query_timeout)
+            return query, page, items, total
+        except asyncio.TimeoutError:
+            print(f"GitHub 搜索超时: {query} 第 {page} 页")
+        except aiohttp.ClientError as e:
+            print(f"GitHub 搜索出错: {query} 第 {page} 页: {str(e)}")
+        return query, page, None, None
+
+    async def fetch_page(self, session, query, page):
+        entry, fresh = search_cache.get(query, page=page, per_page=self.PER_PAGE)
+        if entry is not None:
+            if not fresh:
+                self.revalidations.append(asyncio.create_task(self.revalidate(session, query, page)))
+            return entry['items'], entry.get('total')
+        items, total, _ = await self.request_page(session, query, page)
+        return items, total
+
+    async def revalidate(self, session, query, page):
+        # 结果没有变化或请求失败时返回的仓库列表为 None
+        try:
+            items, total, changed = await asyncio.wait_for(self.request_page(session, query, page), self.query_timeout)
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            print(f"GitHub 搜索缓存更新失败: {query}: {str(e)}")
+            return query, page, None, None
+        if items is None or not changed:
+            return query, page, None, None
+        return query, page, items, total
+
+    async def request_page(self, session, query, page):
+        # 返回 (仓库列表, 结果总数, 是否与缓存不同)
+        url = (f"https://api.github.com/search/repositories?q={query}&sort=stars&order=desc"
+               f"&per_page={self.PER_PAGE}&page={page}")
+        # 搜索只读公开数据，使用 token 池中配额最多的 token，而不是未认证的每分钟 10 次
+        response = await http_cache.get(session, url, priority=PRIORITY_INTERACTIVE, pooled=True)
+        if response.status == 200:
+            items = response.data['items']
+            total = response.data.get('total_count')
+            changed = search_cache.put(query, items, total, page=page, per_page=self.PER_PAGE)
+            return items, total, changed
+        else:
+            print(f"GitHub 搜索失败: {response.status}")
+            return None, None, False
 
     def sort_results(self, results):
-        return sorted(results, key=lambda x: (
-            -x['stargazers_count'],
-            -x['watchers_count'],
-            datetime.strptime(x['updated_at'], "%Y-%m-%dT%H:%M:%SZ")
-        ), reverse=True)
+        return rank_results(results, self.ranking, self.search_text)
 
 def create_repo_widget(repo, search_text):
     widget = QtWidgets.QWidget()
@@ -126,17 +266,22 @@ def highlight_text(text, search_text):
     )
     return highlighted_text
 
-def search_github(search_text, callback):
-    search_widget = GitHubSearchWidget()
-    search_widget.search_completed.connect(callback)
+def search_github(search_text, callback, http_client, refresh_callback=None, ranking='stars', tasks=None):
+    # callback 会被多次调用，每次收到一批新结果；返回的搜索对象可用于加载更多或取消
+    search_widget = GitHubSearchWidget(http_client=http_client, ranking=ranking, tasks=tasks)
+    search_widget.results_ready.connect(callback)
+    if refresh_callback:
+        search_widget.search_updated.connect(refresh_callback)
     search_widget.search_input.setText(search_text)
     search_widget.perform_search()
+    return search_widget
 
 def show_github_search_dialog(parent):
     dialog = GitHubSearchDialog(parent)
     dialog.exec()
 
 def github_search(query, token):
+    import requests  # 只有这个同步接口用到，避免启动时导入
     url = "https://api.github.com/search/repositories"
     headers = {"Authorization": f"token {token}"}
     params = {"q": query}
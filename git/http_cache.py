@@ -0,0 +1,162 @@
+import asyncio
+import os
+import json
+import hashlib
+import shutil
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+
+class CachedResponse:
+    def __init__(self, status, headers, data, from_cache=False):
+        self.status = status
+        self.headers = headers
+        self.data = data
+        self.from_cache = from_cache
+
+
+class HttpCache:
+    # 需要随缓存内容一起保存的响应头
+    KEPT_HEADERS = ('ETag', 'Last-Modified', 'Link')
+    # 文件内容接口返回 base64 编码的文件，体积大且很少重复请求，不缓存
+    UNCACHED_PATHS = ('/contents/', '/git/blobs/')
+
+    def __init__(self, cache_dir=None, max_bytes=50 * 1024 * 1024, max_entries=5000, max_entry_bytes=1024 * 1024):
+        if cache_dir is None:
+            cache_dir = os.path.join(os.getcwd(), 'data', 'cache', 'http')
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes  # 缓存目录总大小上限，超出时按最近使用时间淘汰
+        self.max_entries = max_entries
+        self.max_entry_bytes = max_entry_bytes  # 超过这个大小的单个响应不缓存
+        self.entries = None  # 缓存键 -> 文件大小，最久未使用的在前；第一次写入时扫描目录建立
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+    def cache_key(self, url, headers):
+        # 不同 token 看到的内容不同，所以把 Authorization 也算进缓存键
+        auth = (headers or {}).get('Authorization', '')
+        return hashlib.sha1(f"{auth}\n{url}".encode('utf-8')).hexdigest()
+
+    def cache_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + '.json')
+
+    def load(self, key):
+        path = self.cache_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # 更新修改时间，重启后重新扫描目录时仍能按最近使用排序
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self.lock:
+            if self.entries is not None and key in self.entries:
+                self.entries.move_to_end(key)
+        return entry
+
+    def cacheable(self, url, data):
+        path = urlsplit(url).path
+        if any(part in path for part in self.UNCACHED_PATHS):
+            return False
+        return not (isinstance(data, dict) and data.get('encoding') == 'base64')
+
+    def store(self, key, url, headers, data):
+        kept = {name: headers[name] for name in self.KEPT_HEADERS if name in headers}
+        if 'ETag' not in kept and 'Last-Modified' not in kept:
+            return  # 没有校验字段，无法重新验证，不缓存
+        if not self.cacheable(url, data):
+            return
+        text = json.dumps({'url': url, 'headers': kept, 'data': data})
+        size = len(text.encode('utf-8'))
+        if size > min(self.max_entry_bytes, self.max_bytes):
+            return
+        path = self.cache_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"  # 可能有多个线程同时写同一个键
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"写入 HTTP 缓存失败: {str(e)}")
+            return
+        with self.lock:
+            entries = self.index()
+            self.total_bytes += size - entries.pop(key, 0)
+            entries[key] = size
+            self.evict()
+
+    def index(self):
+        # 调用方持有 self.lock
+        if self.entries is None:
+            files = []
+            for root, _, names in os.walk(self.cache_dir):
+                for name in names:
+                    if not name.endswith('.json'):
+                        continue
+                    try:
+                        stat = os.stat(os.path.join(root, name))
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, name[:-len('.json')], stat.st_size))
+            files.sort()
+            self.entries = OrderedDict((key, size) for _, key, size in files)
+            self.total_bytes = sum(size for _, _, size in files)
+        return self.entries
+
+    def evict(self):
+        # 调用方持有 self.lock；淘汰最久未使用的条目，直到总大小和条目数都在上限以内
+        while self.entries and (self.total_bytes > self.max_bytes or len(self.entries) > self.max_entries):
+            key, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(self.cache_path(key))
+            except OSError:
+                pass
+
+    def invalidate(self, url, headers=None):
+        key = self.cache_key(url, headers)
+        try:
+            os.remove(self.cache_path(key))
+        except OSError:
+            pass
+        with self.lock:
+            if self.entries is not None and key in self.entries:
+                self.total_bytes -= self.entries.pop(key)
+
+    def clear(self):
+        with self.lock:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            self.entries = None
+            self.total_bytes = 0
+
+    async def get(self, session, url, headers=None, **kwargs):
+        # 发送条件 GET：命中 304 时直接返回磁盘上的内容
+        # 读写缓存文件（以及第一次写入时扫描缓存目录）都放到线程池中，不阻塞事件循环
+        loop = asyncio.get_running_loop()
+        headers = dict(headers or {})
+        key = self.cache_key(url, headers)
+        entry = await loop.run_in_executor(None, self.load, key)
+        if entry:
+            cached_headers = entry.get('headers', {})
+            if 'ETag' in cached_headers:
+                headers['If-None-Match'] = cached_headers['ETag']
+            if 'Last-Modified' in cached_headers:
+                headers['If-Modified-Since'] = cached_headers['Last-Modified']
+
+        async with session.get(url, headers=headers, **kwargs) as response:
+            if response.status == 304 and entry:
+                return CachedResponse(200, entry.get('headers', {}), entry.get('data'), from_cache=True)
+            data = None
+            if response.status == 200:
+                data = await response.json()
+                await loop.run_in_executor(None, self.store, key, url, response.headers, data)
+            return CachedResponse(response.status, response.headers, data)
+
+
+# 应用内共享的缓存实例
+http_cache = HttpCache()
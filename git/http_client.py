@@ -0,0 +1,65 @@
+import asyncio
+from git.request_scheduler import RateLimitScheduler, ScheduledSession, PRIORITY_INTERACTIVE
+from git.token_pool import TokenPool
+from git.request_tracing import RequestTracer
+
+
+class HttpClient:
+    # 全应用共享的 aiohttp 会话，复用到 api.github.com 的 TCP/TLS 连接
+    # aiohttp 导入较慢，推迟到第一次在事件循环线程中创建会话时再导入，不占用启动时间
+
+    def __init__(self, limit=100, limit_per_host=10, dns_ttl=300, keepalive_timeout=60,
+                 connect_timeout=10, read_timeout=60, total_timeout=None):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.total_timeout = total_timeout
+        self.scheduler = RateLimitScheduler(max_concurrent=limit_per_host)
+        self.token_pool = TokenPool(self.scheduler)
+        self.tracer = RequestTracer()
+        self.session = None
+        self.loop = None
+
+    async def get_session(self):
+        # 会话必须在运行中的事件循环里创建，所以延迟到第一次使用时
+        if self.session is None or self.session.closed:
+            import aiohttp
+            self.loop = asyncio.get_running_loop()
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            timeout = aiohttp.ClientTimeout(total=self.total_timeout, connect=self.connect_timeout,
+                                            sock_read=self.read_timeout)
+            session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            # 所有请求经过限流调度器：按优先级排队，配额用完时自动暂停并重试
+            self.session = ScheduledSession(session, self.scheduler, self.token_pool, tracer=self.tracer)
+        return self.session
+
+    async def warm_up(self):
+        # 启动时在窗口绘制的同时建立到 api.github.com 的 TLS 连接，第一个真正的请求直接复用；
+        # /rate_limit 不消耗 API 配额
+        session = await self.get_session()
+        async with session.get('https://api.github.com/rate_limit', priority=PRIORITY_INTERACTIVE) as response:
+            await response.read()
+            return response.status
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    def close_threadsafe(self, timeout=5):
+        # 从 Qt 线程关闭会话：把 close 投递到会话所在的事件循环并等待完成
+        if self.session is None or self.loop is None or not self.loop.is_running():
+            return
+        future = asyncio.run_coroutine_threadsafe(self.close(), self.loop)
+        try:
+            future.result(timeout)
+        except Exception as e:
+            print(f"关闭 HTTP 会话时出错: {str(e)}")
@@ -1,42 +1,353 @@
 from PyQt6 import QtWidgets, QtCore, QtGui
 import datetime
 import os
+from git.log_writer import LogWriter
+from git.request_tracing import LATENCY_BUCKETS
+from git.upload_pipeline import format_bytes
+
+# 日志级别，数值越大越严重
+LOG_LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+LEVEL_COLORS = {"DEBUG": "#888888", "WARNING": "#b36b00", "ERROR": "#c0392b"}
+
+
+class RingBuffer:
+    # 固定容量的环形缓冲区，满了之后覆盖最旧的元素，按下标访问为 O(1)
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.items = [None] * capacity
+        self.start = 0
+        self.size = 0
+
+    def append(self, item):
+        # 返回被覆盖的最旧元素，没有覆盖时返回 None
+        evicted = None
+        if self.size < self.capacity:
+            self.items[(self.start + self.size) % self.capacity] = item
+            self.size += 1
+        else:
+            evicted = self.items[self.start]
+            self.items[self.start] = item
+            self.start = (self.start + 1) % self.capacity
+        return evicted
+
+    def popleft(self):
+        item = self.items[self.start]
+        self.items[self.start] = None
+        self.start = (self.start + 1) % self.capacity
+        self.size -= 1
+        return item
+
+    def first(self):
+        return self.items[self.start] if self.size else None
+
+    def clear(self):
+        self.items = [None] * self.capacity
+        self.start = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        return self.items[(self.start + index) % self.capacity]
+
+    def __iter__(self):
+        for index in range(self.size):
+            yield self.items[(self.start + index) % self.capacity]
+
+
+class LogEntry:
+    __slots__ = ('level', 'text')
+
+    def __init__(self, level, text):
+        self.level = level
+        self.text = text
+
+
+class LogModel(QtCore.QAbstractListModel):
+    # entries 保存最近 capacity 条日志，visible 是通过级别过滤的那部分；
+    # 新日志先暂存，定时批量插入，避免大量日志时每条都触发一次界面更新
+
+    def __init__(self, capacity=200000, parent=None):
+        super().__init__(parent)
+        self.entries = RingBuffer(capacity)
+        self.visible = RingBuffer(capacity)
+        self.min_level = 0
+        self.pending = []
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.visible)
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.visible):
+            return None
+        entry = self.visible[index.row()]
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            # 多行日志（如卡顿时的调用栈）只显示第一行，完整内容在提示中
+            first_line, _, rest = entry.text.partition('\n')
+            return first_line + " …" if rest else first_line
+        if role == QtCore.Qt.ItemDataRole.ToolTipRole and '\n' in entry.text:
+            return entry.text
+        if role == QtCore.Qt.ItemDataRole.ForegroundRole and entry.level in LEVEL_COLORS:
+            return QtGui.QColor(LEVEL_COLORS[entry.level])
+        return None
+
+    def add(self, level, text):
+        self.pending.append(LogEntry(level, text))
+
+    def flush_pending(self):
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+        new_visible = []
+        for entry in pending:
+            evicted = self.entries.append(entry)
+            # 被挤出缓冲区的日志如果正在显示，它一定是 visible 的第一行
+            if evicted is not None and self.visible.first() is evicted:
+                self.beginRemoveRows(QtCore.QModelIndex(), 0, 0)
+                self.visible.popleft()
+                self.endRemoveRows()
+            if LOG_LEVELS.get(entry.level, 0) >= self.min_level:
+                new_visible.append(entry)
+        if not new_visible:
+            return
+        # 本批次比容量还多时只保留最后的部分
+        new_visible = new_visible[-self.visible.capacity:]
+        overflow = len(self.visible) + len(new_visible) - self.visible.capacity
+        if overflow > 0:
+            self.beginRemoveRows(QtCore.QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self.visible.popleft()
+            self.endRemoveRows()
+        start = len(self.visible)
+        self.beginInsertRows(QtCore.QModelIndex(), start, start + len(new_visible) - 1)
+        for entry in new_visible:
+            self.visible.append(entry)
+        self.endInsertRows()
+
+    def set_min_level(self, min_level):
+        self.flush_pending()
+        self.beginResetModel()
+        self.min_level = min_level
+        self.visible.clear()
+        for entry in self.entries:
+            if LOG_LEVELS.get(entry.level, 0) >= min_level:
+                self.visible.append(entry)
+        self.endResetModel()
+
+    def clear(self):
+        self.beginResetModel()
+        self.entries.clear()
+        self.visible.clear()
+        self.pending = []
+        self.endResetModel()
+
+
+def format_ms(seconds):
+    return f"{seconds * 1000:.0f} ms"
+
+
+def histogram_bar(buckets):
+    # 用方块字符画出延迟分布，每个字符对应一个桶
+    blocks = " ▁▂▃▄▅▆▇█"
+    peak = max(buckets) or 1
+    return ''.join(blocks[round(count / peak * (len(blocks) - 1))] for count in buckets)
+
 
 class LogTab(QtWidgets.QWidget):
-    def __init__(self, parent=None):
+    STATS_COLUMNS = ["接口", "次数", "错误", "平均排队", "平均延迟", "P50", "P90", "P99", "最大", "流量", "分布"]
+
+    def __init__(self, parent=None, capacity=200000, tracer=None):
         super().__init__(parent)
+        self.model = LogModel(capacity, self)
+        self.tracer = tracer  # 请求追踪，统计表每两秒刷新一次
+        self.profiler = None
         self.init_ui()
-        
+
         # 创建 data/log 目录
         self.data_dir = os.path.join(os.getcwd(), 'data')
         self.log_dir = os.path.join(self.data_dir, 'log')
         os.makedirs(self.log_dir, exist_ok=True)
-        
+
         self.log_file = os.path.join(self.log_dir, 'app.log')
+        # 后台线程批量写入日志文件，并按大小和日期轮转
+        self.writer = LogWriter(self.log_dir)
+
+        # 新日志每 100 毫秒批量显示一次
+        self.flush_timer = QtCore.QTimer(self)
+        self.flush_timer.setInterval(100)
+        self.flush_timer.timeout.connect(self.flush_view)
+        self.flush_timer.start()
+
+        self.stats_timer = QtCore.QTimer(self)
+        self.stats_timer.setInterval(2000)
+        self.stats_timer.timeout.connect(self.refresh_request_stats)
+        self.stats_timer.start()
 
     def init_ui(self):
         layout = QtWidgets.QVBoxLayout(self)
 
-        # 创建文本编辑器用于显示日志
-        self.log_display = QtWidgets.QTextEdit()
-        self.log_display.setReadOnly(True)
-        layout.addWidget(self.log_display)
+        filter_layout = QtWidgets.QHBoxLayout()
+        filter_layout.addWidget(QtWidgets.QLabel("最低级别:"))
+        self.level_combo = QtWidgets.QComboBox()
+        self.level_combo.addItems(list(LOG_LEVELS))
+        self.level_combo.setCurrentText("DEBUG")
+        self.level_combo.currentTextChanged.connect(self.on_level_changed)
+        filter_layout.addWidget(self.level_combo)
+        filter_layout.addStretch()
+        layout.addLayout(filter_layout)
+
+        # 使用 model/view 显示日志，行高一致时只需绘制可见的行
+        self.log_display = QtWidgets.QListView()
+        self.log_display.setModel(self.model)
+        self.log_display.setUniformItemSizes(True)
+        self.log_display.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.log_display.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.SystemFont.FixedFont))
+
+        # 每个 GitHub 接口的请求次数和延迟分布
+        self.stats_table = QtWidgets.QTableWidget(0, len(self.STATS_COLUMNS))
+        self.stats_table.setHorizontalHeaderLabels(self.STATS_COLUMNS)
+        self.stats_table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.stats_table.verticalHeader().setVisible(False)
+        self.stats_table.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeMode.Stretch)
+        bounds = ", ".join("∞" if bound == float('inf') else format_ms(bound) for bound in LATENCY_BUCKETS)
+        self.stats_table.horizontalHeaderItem(len(self.STATS_COLUMNS) - 1).setToolTip(f"延迟分桶上界: {bounds}")
 
+        splitter = QtWidgets.QSplitter(QtCore.Qt.Orientation.Vertical)
+        splitter.addWidget(self.log_display)
+        splitter.addWidget(self.stats_table)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 1)
+        layout.addWidget(splitter)
+
+        button_layout = QtWidgets.QHBoxLayout()
         # 创建清除按钮
         clear_button = QtWidgets.QPushButton("清除日志")
         clear_button.clicked.connect(self.clear_log)
-        layout.addWidget(clear_button)
+        button_layout.addWidget(clear_button)
+
+        export_button = QtWidgets.QPushButton("导出请求追踪")
+        export_button.clicked.connect(self.export_trace)
+        button_layout.addWidget(export_button)
+
+        reset_button = QtWidgets.QPushButton("重置请求统计")
+        reset_button.clicked.connect(self.reset_request_stats)
+        button_layout.addWidget(reset_button)
 
-    def add_log(self, message):
+        self.profile_button = QtWidgets.QPushButton("开始性能分析")
+        self.profile_button.setToolTip("用 cProfile 记录 Qt 线程和 asyncio 线程，停止后保存到 data/log")
+        self.profile_button.setEnabled(False)
+        self.profile_button.clicked.connect(self.toggle_profiler)
+        button_layout.addWidget(self.profile_button)
+        layout.addLayout(button_layout)
+
+    def add_log(self, message, level="INFO"):
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] {message}"
-        self.log_display.append(log_entry)
-        
-        # 将日志写入文件
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(log_entry + '\n')
+        log_entry = f"[{timestamp}] [{level}] {message}"
+        self.model.add(level, log_entry)
+
+        # 将日志交给后台线程写入文件
+        self.writer.write(log_entry)
+
+    def flush_view(self):
+        if not self.model.pending:
+            return
+        # 只有原本就停在底部时才自动滚动，方便查看旧日志
+        scroll_bar = self.log_display.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum()
+        self.model.flush_pending()
+        if at_bottom:
+            self.log_display.scrollToBottom()
+
+    def on_level_changed(self, level):
+        self.model.set_min_level(LOG_LEVELS[level])
+        self.log_display.scrollToBottom()
 
     def clear_log(self):
-        self.log_display.clear()
+        self.model.clear()
         # 清除日志文件内容
-        open(self.log_file, 'w').close()
+        self.writer.clear()
+
+    def refresh_request_stats(self):
+        if self.tracer is None or not self.isVisible():
+            return
+        summary = self.tracer.summary()
+        self.stats_table.setRowCount(len(summary))
+        for row, (endpoint, stats) in enumerate(summary):
+            values = [
+                endpoint,
+                str(stats.count),
+                str(stats.errors),
+                format_ms(stats.total_queue_wait / stats.count),
+                format_ms(stats.total_latency / stats.count),
+                format_ms(stats.percentile(0.5)),
+                format_ms(stats.percentile(0.9)),
+                format_ms(stats.percentile(0.99)),
+                format_ms(stats.max_latency),
+                format_bytes(stats.bytes),
+                histogram_bar(stats.buckets),
+            ]
+            for column, value in enumerate(values):
+                item = self.stats_table.item(row, column)
+                if item is None:
+                    item = QtWidgets.QTableWidgetItem()
+                    self.stats_table.setItem(row, column, item)
+                item.setText(value)
+
+    def export_trace(self):
+        if self.tracer is None:
+            return
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "导出请求追踪", os.path.join(self.log_dir, 'trace.jsonl'), "JSON Lines (*.jsonl)")
+        if not path:
+            return
+        try:
+            count = self.tracer.export_jsonl(path)
+        except OSError as e:
+            QtWidgets.QMessageBox.warning(self, "导出失败", str(e))
+            return
+        self.add_log(f"已导出 {count} 条请求记录到 {path}")
+
+    def reset_request_stats(self):
+        if self.tracer is not None:
+            self.tracer.reset()
+        self.stats_table.setRowCount(0)
+
+    def set_profiler(self, profiler):
+        self.profiler = profiler
+        self.profile_button.setEnabled(profiler is not None)
+        self.update_profile_button()
+
+    def toggle_profiler(self):
+        if self.profiler.running:
+            self.stop_profiler()
+        else:
+            self.profiler.start()
+            self.add_log("性能分析已开始")
+        self.update_profile_button()
+
+    def stop_profiler(self):
+        try:
+            paths = self.profiler.stop()
+        except OSError as e:
+            self.add_log(f"保存性能分析结果失败: {str(e)}", "ERROR")
+            return
+        for path in paths:
+            self.add_log(f"性能分析结果已保存到 {path}")
+
+    def update_profile_button(self):
+        running = self.profiler is not None and self.profiler.running
+        self.profile_button.setText("停止性能分析" if running else "开始性能分析")
+
+    def shutdown(self):
+        # 退出前保存进行中的性能分析，并把缓冲中的日志写入文件
+        if self.profiler is not None and self.profiler.running:
+            self.stop_profiler()
+        self.flush_timer.stop()
+        self.stats_timer.stop()
+        self.writer.close()
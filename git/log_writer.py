@@ -0,0 +1,139 @@
+import os
+import queue
+import threading
+import time
+
+
+class LogWriter:
+    # 日志先放入队列，由后台线程批量写入文件；文件超过 max_bytes 或跨天时轮转
+    # app.log -> app.log.1 -> ... -> app.log.{backup_count}，最旧的被删除
+
+    def __init__(self, log_dir, file_name='app.log', max_bytes=5 * 1024 * 1024, backup_count=5,
+                 flush_interval=1.0, rotate_daily=True):
+        os.makedirs(log_dir, exist_ok=True)
+        self.path = os.path.join(log_dir, file_name)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.rotate_daily = rotate_daily
+        self.queue = queue.Queue()
+        self.file = None
+        self.file_day = None
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, name='log-writer', daemon=True)
+        self.thread.start()
+
+    def write(self, line):
+        if not self.closed:
+            self.queue.put(line)
+
+    def flush(self, timeout=5):
+        # 等待队列中已有的日志写入磁盘
+        self.call(None, timeout)
+
+    def clear(self):
+        self.call(self.truncate)
+
+    def close(self, timeout=5):
+        if self.closed:
+            return
+        self.flush(timeout)
+        self.closed = True
+        self.queue.put(StopIteration)
+        self.thread.join(timeout)
+
+    def call(self, func, timeout=5):
+        # 在写入线程中执行 func，保证与写入顺序一致
+        done = threading.Event()
+        self.queue.put((func, done))
+        done.wait(timeout)
+
+    def run(self):
+        buffer = []
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(self.flush_interval - (time.monotonic() - last_flush), 0) if buffer else None
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, str):
+                buffer.append(item)
+                # 继续取出已经排队的日志，一次写入
+                while True:
+                    try:
+                        item = self.queue.get_nowait()
+                    except queue.Empty:
+                        item = None
+                        break
+                    if not isinstance(item, str):
+                        break
+                    buffer.append(item)
+
+            if item is not None or time.monotonic() - last_flush >= self.flush_interval:
+                self.write_lines(buffer)
+                buffer = []
+                last_flush = time.monotonic()
+
+            if item is StopIteration:
+                self.close_file()
+                return
+            if isinstance(item, tuple):
+                func, done = item
+                if func:
+                    func()
+                done.set()
+
+    def write_lines(self, lines):
+        if not lines:
+            return
+        try:
+            self.rotate_if_needed()
+            if self.file is None:
+                self.open_file()
+            self.file.write(''.join(line + '\n' for line in lines))
+            self.file.flush()
+        except OSError as e:
+            print(f"写入日志文件失败: {str(e)}")
+
+    def open_file(self):
+        self.file = open(self.path, 'a', encoding='utf-8')
+        try:
+            self.file_day = time.localtime(os.path.getmtime(self.path))[:3]
+        except OSError:
+            self.file_day = time.localtime()[:3]
+        if self.file.tell() == 0:
+            self.file_day = time.localtime()[:3]
+
+    def close_file(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def rotate_if_needed(self):
+        if self.file is None:
+            if not os.path.exists(self.path):
+                return
+            self.open_file()
+        size = self.file.tell()
+        if size == 0:
+            return
+        if size < self.max_bytes and not (self.rotate_daily and self.file_day != time.localtime()[:3]):
+            return
+        self.close_file()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def truncate(self):
+        self.close_file()
+        try:
+            open(self.path, 'w').close()
+        except OSError as e:
+            print(f"清除日志文件失败: {str(e)}")
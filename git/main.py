@@ -1,6 +1,10 @@
 # Note: QtAsyncio is not used in this file
 import sys
 import os
+import time
+
+# 启动计时从这里开始，之后的导入都计入“导入模块”阶段
+STARTED = time.perf_counter()
 
 # 添加项目根目录到 Python 路径
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -10,12 +14,16 @@ sys.path.append(parent_dir)
 import asyncio
 from PyQt6 import QtWidgets, QtGui, QtCore
 from git.token_tab import TokenTab
-from git.repository_tab import RepositoryTab
 from git.search_widget import SearchWidget
-from git.github_search import GitHubSearchDialog, search_github, create_repo_widget
-import aiohttp
-from datetime import datetime
+from git.search_ranker import SearchRanker, RANKINGS
+from git.repo_list_view import RepoListModel, RepoItemDelegate, create_repo_list_view
 from git.log_tab import LogTab
+from git.http_client import HttpClient
+from git.watchdog import LoopWatchdog
+from git.profiler import Profiler
+from git.task_runner import TaskRunner
+from git.startup_timer import StartupTimer
+# repository_tab 和 github_search 依赖 aiohttp 等较慢的模块，第一次用到时再导入
 
 # 临时创建占位类
 class PlaceholderTab(QtWidgets.QWidget):
@@ -30,6 +38,8 @@ class HomeTab(QtWidgets.QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.main_window = parent
+        self.github_search = None  # 当前进行中的 GitHub 搜索，滚动到底部时从它加载更多
+        self.ranker = SearchRanker()  # 只保留排名前 1000 的 GitHub 结果
         self.init_ui()
 
     def init_ui(self):
@@ -46,32 +56,29 @@ class HomeTab(QtWidgets.QWidget):
         self.search_type.addItems(["GitHub", "本地"])
         search_layout.addWidget(self.search_type)
 
+        self.ranking_combo = QtWidgets.QComboBox()
+        self.ranking_combo.addItems(list(RANKINGS))
+        self.ranking_combo.currentTextChanged.connect(self.on_ranking_changed)
+        search_layout.addWidget(self.ranking_combo)
+
         self.search_button = QtWidgets.QPushButton("搜索")
         self.search_button.clicked.connect(self.perform_search)
         search_layout.addWidget(self.search_button)
 
         layout.addLayout(search_layout)
 
-        # 搜索结果区域
-        self.search_results_scroll = QtWidgets.QScrollArea()
-        self.search_results_scroll.setWidgetResizable(True)
-        self.search_results_scroll.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.search_results_scroll.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        self.search_results_scroll.setFixedHeight(500)  # 设置固定高度
-        self.search_results_scroll.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background-color: #f0f0f0;
-            }
-        """)
-        self.search_results_scroll.setVisible(False)  # 初始时隐藏搜索果区域
-
-        self.search_results_widget = QtWidgets.QWidget()
-        self.search_results_layout = QtWidgets.QVBoxLayout(self.search_results_widget)
-        self.search_results_layout.setAlignment(QtCore.Qt.AlignmentFlag.AlignTop)
-        self.search_results_scroll.setWidget(self.search_results_widget)
+        # 搜索结果区域，使用 model/view 只绘制可见的结果
+        self.search_results_model = RepoListModel(self)
+        self.search_results_delegate = RepoItemDelegate(
+            self, title_key='full_name', show_language=False,
+            stats_func=lambda repo: f"⭐ {repo['stargazers_count']} | 👀 {repo['watchers_count']} | 🕒 {repo['updated_at']}")
+        self.search_results_view = create_repo_list_view(self.search_results_model, self.search_results_delegate)
+        self.search_results_view.setFixedHeight(500)  # 设置固定高度
+        self.search_results_view.doubleClicked.connect(self.open_search_result)
+        self.search_results_view.verticalScrollBar().valueChanged.connect(self.on_results_scrolled)
+        self.search_results_view.setVisible(False)  # 初始时隐藏搜索结果区域
 
-        layout.addWidget(self.search_results_scroll)
+        layout.addWidget(self.search_results_view)
 
         # 欢迎标签和卡片部分
         self.welcome_widget = QtWidgets.QWidget()
@@ -132,74 +139,90 @@ class HomeTab(QtWidgets.QWidget):
         search_type = self.search_type.currentText()
         if search_text:
             self.welcome_widget.setVisible(False)
-            self.search_results_scroll.setVisible(True)
+            self.search_results_view.setVisible(True)
             if search_type == "本地":
                 self.search_local_repos(search_text)
             else:
                 self.search_github_repos(search_text)
         else:
             self.welcome_widget.setVisible(True)
-            self.search_results_scroll.setVisible(False)
+            self.search_results_view.setVisible(False)
 
     def search_local_repos(self, search_text):
+        self.cancel_github_search()
         self.clear_search_results()
-        local_results = self.main_window.repository_tab.filter_repos(search_text, "全部")
+        local_results = self.main_window.ensure_repository_tab().filter_repos(search_text, "全部")
         if local_results is None:
             print("警告：filter_repos 返回了 None")
             local_results = []  # 如果是 None，使用空列表
-        for repo in local_results:
-            self.add_search_result(repo, is_local=True)
+        self.search_results_delegate.search_text = search_text
+        self.search_results_model.set_repos(local_results)
 
     def search_github_repos(self, search_text):
+        self.cancel_github_search()
         self.clear_search_results()
-        search_github(search_text, self.display_github_results)
+        self.search_results_delegate.search_text = search_text
+        ranking = RANKINGS[self.ranking_combo.currentText()]
+        self.ranker.reset(ranking, search_text)
+        from git.github_search import search_github
+        self.github_search = search_github(search_text, self.display_github_results,
+                                           self.main_window.http_client, self.refresh_github_results, ranking,
+                                           self.main_window.tasks)
+        self.github_search.search_completed.connect(self.on_github_search_completed)
 
     @QtCore.pyqtSlot(list)
     def display_github_results(self, repos):
-        for repo in repos:
-            result_widget = create_repo_widget(repo, self.search_input.text())
-            self.search_results_layout.addWidget(result_widget)
-        self.search_results_scroll.setVisible(True)
+        # 每收到一页就插入到已排序的列表中，不必等所有查询完成；超出前 1000 名的结果被挤出
+        if self.sender() is not self.github_search:
+            return  # 已被新搜索取代
+        accepted, evicted = self.ranker.extend(repos)
+        self.search_results_model.remove_sorted(evicted, self.ranker.key)
+        self.search_results_model.insert_sorted(accepted, self.ranker.key)
+        self.search_results_view.setVisible(True)
         self.welcome_widget.setVisible(False)
 
-    def add_search_result(self, repo, is_local):
-        result_widget = self.create_repo_widget(repo, is_local)
-        self.search_results_layout.addWidget(result_widget)
+    @QtCore.pyqtSlot(list)
+    def refresh_github_results(self, repos):
+        # 缓存的结果在后台更新后，用新结果替换当前列表
+        if self.sender() is not self.github_search:
+            return
+        self.show_ranked_results(repos)
+
+    def on_ranking_changed(self, text):
+        self.ranker.reset(RANKINGS[text])
+        if self.github_search is not None:
+            self.github_search.ranking = self.ranker.ranking
+            # all_results 在事件循环线程中追加，复制一份再排序
+            self.show_ranked_results(list(self.github_search.all_results))
+
+    def show_ranked_results(self, repos):
+        self.ranker.reset()
+        self.ranker.extend(repos)
+        self.search_results_model.set_repos(self.ranker.ranked(), self.ranker.key)
+
+    @QtCore.pyqtSlot(list)
+    def on_github_search_completed(self, repos):
+        # 第一页结果不足以出现滚动条时，无法通过滚动触发加载，主动加载一次
+        if self.sender() is self.github_search and self.search_results_view.verticalScrollBar().maximum() == 0:
+            self.github_search.load_more()
+
+    def on_results_scrolled(self, value):
+        scroll_bar = self.search_results_view.verticalScrollBar()
+        if self.github_search is not None and value >= scroll_bar.maximum() - scroll_bar.pageStep():
+            self.github_search.load_more()
+
+    def cancel_github_search(self):
+        if self.github_search is not None:
+            self.github_search.cancel()
+            self.github_search = None
 
     def clear_search_results(self):
-        while self.search_results_layout.count():
-            item = self.search_results_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        self.search_results_model.clear()
 
-    def create_repo_widget(self, repo, is_local):
-        widget = QtWidgets.QWidget()
-        layout = QtWidgets.QVBoxLayout(widget)
-        layout.setContentsMargins(10, 5, 10, 5)
-        
-        name_label = QtWidgets.QLabel(f"<b>{repo['full_name']}</b>")
-        layout.addWidget(name_label)
-        
-        description_label = QtWidgets.QLabel(repo['description'] or "No description")
-        description_label.setWordWrap(True)
-        layout.addWidget(description_label)
-        
-        stats_label = QtWidgets.QLabel(f"⭐ {repo['stargazers_count']} | 👀 {repo['watchers_count']} | 🕒 {repo['updated_at']}")
-        layout.addWidget(stats_label)
-        
-        url_label = QtWidgets.QLabel(f"<a href='{repo['html_url']}'>{repo['html_url']}</a>")
-        url_label.setOpenExternalLinks(True)
-        layout.addWidget(url_label)
-        
-        widget.setStyleSheet("""
-            QWidget {
-                background-color: white;
-                border-radius: 5px;
-                margin-bottom: 5px;
-            }
-        """)
-        
-        return widget
+    def open_search_result(self, index):
+        repo = self.search_results_model.repo_at(index.row())
+        if repo:
+            QtGui.QDesktopServices.openUrl(QtCore.QUrl(repo['html_url']))
 
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self):
@@ -222,16 +245,22 @@ class MainWindow(QtWidgets.QMainWindow):
         self.tab_widget = QtWidgets.QTabWidget()
         self.main_layout.addWidget(self.tab_widget)
         
-        # 添加选项卡
+        # 所有选项卡共享的 HTTP 客户端和后台任务调度
+        self.http_client = HttpClient()
+        self.tasks = TaskRunner(self)
+        self.tasks.task_failed.connect(lambda kind, error: self.log_message(f"后台任务 {kind} 出错: {error}", "ERROR"))
+
+        # 添加选项卡；仓库页启动时不可见，先放占位页，第一次打开时再创建
         self.home_tab = HomeTab(self)
-        self.repository_tab = RepositoryTab(self)  # 传入 self 作为 main_window 参数
+        self.repository_tab = None
         self.token_tab = TokenTab(self)  # 传入 self 作为 main_window 参数
-        self.log_tab = LogTab()
+        self.log_tab = LogTab(tracer=self.http_client.tracer)
         
         self.tab_widget.addTab(self.home_tab, "主页")
-        self.tab_widget.addTab(self.repository_tab, "仓库")
+        self.tab_widget.addTab(PlaceholderTab("仓库"), "仓库")
         self.tab_widget.addTab(self.token_tab, "令牌")
         self.tab_widget.addTab(self.log_tab, "日志")
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
         
         # 创建状态栏
         self.statusBar = QtWidgets.QStatusBar()
@@ -260,11 +289,33 @@ class MainWindow(QtWidgets.QMainWindow):
         self.data_dir = os.path.join(os.getcwd(), 'data')
         os.makedirs(self.data_dir, exist_ok=True)
 
+    def on_tab_changed(self, index):
+        if index == 1:
+            self.ensure_repository_tab()
+
+    def ensure_repository_tab(self):
+        if self.repository_tab is None:
+            from git.repository_tab import RepositoryTab
+            self.repository_tab = RepositoryTab(self)  # 传入 self 作为 main_window 参数
+            self.repository_tab.current_token = self.token_tab.current_token
+            self.repository_tab.current_username = self.token_tab.current_username
+            # 替换占位页，保持当前选中的标签页不变
+            current = self.tab_widget.currentIndex()
+            placeholder = self.tab_widget.widget(1)
+            self.tab_widget.blockSignals(True)
+            self.tab_widget.removeTab(1)
+            self.tab_widget.insertTab(1, self.repository_tab, "仓库")
+            self.tab_widget.setCurrentIndex(current)
+            self.tab_widget.blockSignals(False)
+            placeholder.deleteLater()
+        return self.repository_tab
+
     def search_local_repos(self, search_text):
         self.tab_widget.setCurrentIndex(1)  # 换到仓库标签页
-        self.repository_tab.filter_repos(search_text, "全")
+        self.ensure_repository_tab().filter_repos(search_text, "全")
 
     def search_github(self, search_text):
+        from git.github_search import GitHubSearchDialog
         dialog = GitHubSearchDialog(self)
         dialog.search_widget.search_input.setText(search_text)
         dialog.search_widget.perform_search()
@@ -370,15 +421,34 @@ class MainWindow(QtWidgets.QMainWindow):
             self.login_status_label.setText("未登录")
 
     def update_repository_username(self, username):
+        if self.repository_tab is None:
+            return  # 仓库页创建时会从 token_tab 读取
         self.repository_tab.current_username = username
         self.repository_tab.current_token = self.token_tab.current_token  # 添加这行
 
-    def log_message(self, message):
-        self.log_tab.add_log(message)
+    def log_message(self, message, level="INFO"):
+        self.log_tab.add_log(message, level)
+
+    def closeEvent(self, event):
+        # 退出前取消还在运行的后台任务，关闭共享的 HTTP 会话，保存搜索缓存，并把缓冲中的日志写入文件
+        self.tasks.cancel_all()
+        self.http_client.close_threadsafe()
+        if 'git.search_cache' in sys.modules:
+            # 只有用过 GitHub 搜索时才加载了搜索缓存；启动时不导入它，避免读取缓存文件
+            sys.modules['git.search_cache'].search_cache.save()
+        self.log_tab.shutdown()
+        super().closeEvent(event)
 
 def main():
+    # 设置 GITCLIENT_STARTUP_BENCH 时记录启动各阶段耗时，首次绘制和 TLS 预热都完成后退出；
+    # 值为 1 时结果追加到 data/log/startup.jsonl，否则视为输出文件路径（见 startup_bench.py）
+    bench = os.environ.get('GITCLIENT_STARTUP_BENCH')
+    timer = StartupTimer(STARTED)
+    timer.mark("导入模块")
     app = QtWidgets.QApplication(sys.argv)
+    timer.mark("创建 QApplication")
     window = MainWindow()
+    timer.mark("构建主窗口")
     window.show()
 
     # 创建一个新的事件循环
@@ -392,9 +462,50 @@ def main():
     # 在单独的线程中运行异步事件循环
     import threading
     threading.Thread(target=run_async_loop, daemon=True).start()
+    # 此前提交的任务（如自动登录）在这里开始运行
+    window.tasks.attach(loop)
+
+    # 首次绘制和 TLS 预热都完成后输出启动耗时
+    pending = {"首次绘制", "TLS 预热"}
+
+    def startup_step_done(phase):
+        timer.mark(phase)
+        pending.discard(phase)
+        if pending:
+            return
+        print(timer.report())
+        if bench:
+            timer.save(os.path.join(window.log_tab.log_dir, 'startup.jsonl') if bench == '1' else bench)
+            window.close()
+
+    def warm_up_done(status):
+        startup_step_done("TLS 预热")
+
+    def warm_up_failed(error):
+        window.log_message(f"预热到 api.github.com 的连接失败: {type(error).__name__}: {error}", "WARNING")
+        startup_step_done("TLS 预热")
+
+    # 窗口绘制的同时在事件循环线程中导入 aiohttp 并建立 TLS 连接
+    window.tasks.submit(window.http_client.warm_up, kind='warmup', on_done=warm_up_done, on_error=warm_up_failed)
+
+    # 监视两个事件循环的卡顿；阈值可用 GITCLIENT_STALL_MS 调整
+    watchdog = LoopWatchdog(threshold=int(os.environ.get('GITCLIENT_STALL_MS', '250')) / 1000)
+    watchdog.stall_detected.connect(lambda text: window.log_message(text, "WARNING"))
+    watchdog.start(loop)
+
+    profiler = Profiler(loop, window.log_tab.log_dir)
+    window.log_tab.set_profiler(profiler)
+    if os.environ.get('GITCLIENT_PROFILE'):
+        # 设置 GITCLIENT_PROFILE=1 时从启动开始分析，退出时保存结果；等两个循环都运行后再开始
+        QtCore.QTimer.singleShot(0, window.log_tab.toggle_profiler)
+    timer.mark("启动事件循环")
+    # 第一个零延迟定时器在窗口首次绘制之后执行
+    QtCore.QTimer.singleShot(0, lambda: startup_step_done("首次绘制"))
 
     # 运行 Qt 事件循环
-    return app.exec()
+    exit_code = app.exec()
+    watchdog.stop()
+    return exit_code
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import json
+import threading
+import time
+
+# 镜像目录中记录每个仓库上次同步时的 pushed_at 和头提交
+MIRROR_INDEX_NAME = '.gitclient-mirror.json'
+
+# 同步结果：内部名称 -> 显示名称
+MIRROR_STATUS_NAMES = {
+    'cloned': "完整下载",
+    'updated': "增量更新",
+    'unchanged': "无变化",
+    'empty': "空仓库",
+    'failed': "失败",
+}
+
+
+class MirrorIndex:
+    def __init__(self, mirror_dir, save_every=50):
+        self.path = os.path.join(mirror_dir, MIRROR_INDEX_NAME)
+        self.entries = {}  # full_name -> {'pushed_at', 'head_sha', 'status', 'synced_at'}
+        self.save_every = save_every  # 每记录多少个仓库保存一次索引
+        self.unsaved = 0
+        self.write_lock = threading.Lock()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def is_current(self, repo, repo_dir):
+        # pushed_at 未变化且本地目录还在时，无需请求任何 API；空仓库不会创建目录，只看 pushed_at
+        entry = self.entries.get(repo['full_name'])
+        if entry is None or entry.get('pushed_at') != repo.get('pushed_at'):
+            return False
+        return entry.get('status') == 'empty' or os.path.isdir(repo_dir)
+
+    def record(self, repo, head_sha, status=None):
+        self.entries[repo['full_name']] = {
+            'pushed_at': repo.get('pushed_at'),
+            'head_sha': head_sha,
+            'status': status,
+            'synced_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        self.unsaved += 1
+
+    def should_save(self):
+        return self.unsaved >= self.save_every
+
+    async def save_async(self):
+        # 在事件循环线程中取快照，写文件放到线程池，不阻塞其他仓库的下载
+        if not self.unsaved:
+            return
+        entries, self.unsaved = dict(self.entries), 0
+        await asyncio.get_running_loop().run_in_executor(None, self.write, entries)
+
+    def write(self, entries):
+        with self.write_lock:
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=1)
+            os.replace(tmp_path, self.path)
+
+
+class ThroughputLimiter:
+    # 令牌桶：所有并发下载共享，写入磁盘的总速度不超过 bytes_per_second
+    # 可以从事件循环（consume）和解压线程（consume_blocking）中同时使用
+
+    def __init__(self, bytes_per_second, burst=None):
+        self.rate = bytes_per_second
+        self.capacity = burst or bytes_per_second
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, size):
+        # 扣除 size 字节，返回需要等待的秒数；一次超过桶容量的写入会被按比例延后
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= size
+            return -self.tokens / self.rate if self.tokens < 0 else 0
+
+    async def consume(self, size):
+        delay = self.reserve(size)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def consume_blocking(self, size):
+        delay = self.reserve(size)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class MirrorResult:
+    def __init__(self, full_name, status, message='', seconds=0.0):
+        self.full_name = full_name
+        self.status = status
+        self.message = message
+        self.seconds = seconds
+
+
+def format_mirror_report(results, elapsed, mirror_dir):
+    counts = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    summary = "，".join(f"{MIRROR_STATUS_NAMES[status]} {counts[status]} 个"
+                       for status in MIRROR_STATUS_NAMES if status in counts)
+    lines = [
+        f"镜像目录: {mirror_dir}",
+        f"完成时间: {time.strftime('%Y-%m-%d %H:%M:%S')}",
+        f"用时: {elapsed:.1f} 秒",
+        f"共 {len(results)} 个仓库：{summary or '无'}",
+        "",
+    ]
+    # 失败的排在最前面，其次是有下载的
+    order = list(MIRROR_STATUS_NAMES)
+    order.insert(0, order.pop(order.index('failed')))
+    for result in sorted(results, key=lambda result: (order.index(result.status), result.full_name)):
+        line = f"[{MIRROR_STATUS_NAMES[result.status]}] {result.full_name}"
+        if result.seconds:
+            line += f" ({result.seconds:.1f} 秒)"
+        if result.message:
+            line += f" - {result.message}"
+        lines.append(line)
+    return summary, "\n".join(lines)
+
+
+def write_mirror_report(mirror_dir, report):
+    path = os.path.join(mirror_dir, f"mirror-report-{time.strftime('%Y%m%d-%H%M%S')}.txt")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(report + "\n")
+    return path
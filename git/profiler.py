@@ -0,0 +1,81 @@
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+
+
+class Profiler:
+    # cProfile 只记录调用 enable 的线程，所以 Qt 线程和 asyncio 线程各用一个；
+    # Python 3.12 起 cProfile 基于 sys.monitoring，一个实例已经覆盖所有线程，第二个会启用失败
+
+    def __init__(self, loop, output_dir, top=30):
+        self.loop = loop
+        self.output_dir = output_dir
+        self.top = top
+        self.profiles = {}
+
+    @property
+    def running(self):
+        return bool(self.profiles)
+
+    def start(self):
+        # 在 Qt 线程中调用
+        if self.running:
+            return
+        qt_profile = cProfile.Profile()
+        qt_profile.enable()
+        self.profiles['qt'] = qt_profile
+
+        loop_profile = cProfile.Profile()
+        try:
+            self.call_in_loop(loop_profile.enable)
+            self.profiles['asyncio'] = loop_profile
+        except (ValueError, RuntimeError, TimeoutError) as e:
+            print(f"asyncio 线程未单独启用性能分析: {str(e)}")
+
+    def stop(self):
+        # 停止分析，每个线程保存一个 .prof 文件和一个按累计时间排序的 .txt 摘要，返回文件路径列表
+        if not self.running:
+            return []
+        profiles, self.profiles = self.profiles, {}
+        profiles['qt'].disable()
+        if 'asyncio' in profiles:
+            try:
+                self.call_in_loop(profiles['asyncio'].disable)
+            except (RuntimeError, TimeoutError) as e:
+                print(f"停止 asyncio 线程性能分析失败: {str(e)}")
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        paths = []
+        for name, profile in profiles.items():
+            path = os.path.join(self.output_dir, f"profile-{stamp}-{name}")
+            profile.dump_stats(path + '.prof')
+            stream = io.StringIO()
+            pstats.Stats(profile, stream=stream).sort_stats('cumulative').print_stats(self.top)
+            with open(path + '.txt', 'w', encoding='utf-8') as f:
+                f.write(stream.getvalue())
+            paths.append(path + '.prof')
+        return paths
+
+    def call_in_loop(self, func, timeout=2):
+        # 在 asyncio 线程中执行 func 并等待完成，异常会在当前线程重新抛出
+        if self.loop is None or not self.loop.is_running():
+            raise RuntimeError("事件循环未运行")
+        done = threading.Event()
+        result = {}
+
+        def run():
+            try:
+                func()
+            except Exception as e:
+                result['error'] = e
+            done.set()
+
+        self.loop.call_soon_threadsafe(run)
+        if not done.wait(timeout):
+            raise TimeoutError("等待事件循环超时")
+        if 'error' in result:
+            raise result['error']
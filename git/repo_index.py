@@ -0,0 +1,186 @@
+class RepoSearchIndex:
+    # 搜索选项对应的字段，与 SearchWidget 的选项保持一致
+    SEARCH_FIELDS = {
+        "全部": ('name', 'description', 'language'),
+        "名称": ('name',),
+        "描述": ('description',),
+        "语言": ('language',),
+    }
+    GRAM_SIZE = 3
+
+    def __init__(self, repos=None):
+        self.rebuild(repos or [])
+
+    def rebuild(self, repos):
+        self.repos = {}      # id -> repo
+        self.positions = {}  # id -> 在列表中的顺序，用于保持原有的排序
+        self.next_position = 0
+        self.fields = {field: FieldIndex() for field in self.SEARCH_FIELDS["全部"]}
+        self.add_repos(repos)
+
+    def copy(self):
+        # 写时复制：修改副本不会影响仍在其他线程中使用的原索引，只复制被修改到的倒排表
+        other = RepoSearchIndex.__new__(RepoSearchIndex)
+        other.repos = dict(self.repos)
+        other.positions = dict(self.positions)
+        other.next_position = self.next_position
+        other.fields = {field: index.copy() for field, index in self.fields.items()}
+        return other
+
+    def add_repos(self, repos):
+        for repo in repos:
+            self.add_repo(repo)
+
+    def add_repo(self, repo):
+        repo_id = repo['id']
+        if repo_id in self.repos:
+            self.remove_repo(repo_id)
+        self.repos[repo_id] = repo
+        self.positions[repo_id] = self.next_position
+        self.next_position += 1
+        for field, index in self.fields.items():
+            index.add(repo_id, repo.get(field))
+
+    def update_repo(self, repo):
+        # 替换仓库数据，保持它在列表中原来的位置
+        position = self.positions.get(repo['id'])
+        self.add_repo(repo)
+        if position is not None:
+            self.positions[repo['id']] = position
+
+    def remove_repo(self, repo_id):
+        repo = self.repos.pop(repo_id, None)
+        if repo is None:
+            return
+        del self.positions[repo_id]
+        for field, index in self.fields.items():
+            index.remove(repo_id, repo.get(field))
+
+    def get(self, repo_id):
+        return self.repos.get(repo_id)
+
+    def __len__(self):
+        return len(self.repos)
+
+    def search(self, search_text, search_option):
+        # 返回排好序的仓库 id：先精确匹配，再部分匹配，各自按原列表顺序
+        # 耗时与命中数成正比：单个字符或常见三元组会命中大部分仓库，5 万个仓库时要几毫秒到几十毫秒，
+        # 所以过滤仍放在后台线程中执行
+        search_text = search_text.lower()
+        exact_matches = set()
+        partial_matches = set()
+        for field in self.SEARCH_FIELDS.get(search_option, ()):
+            exact, partial = self.fields[field].search(search_text)
+            exact_matches |= exact
+            partial_matches |= partial
+        partial_matches -= exact_matches
+
+        position = self.positions.__getitem__
+        return sorted(exact_matches, key=position) + sorted(partial_matches, key=position)
+
+    def filter_repos(self, search_text, search_option):
+        return [self.repos[repo_id] for repo_id in self.search(search_text, search_option)]
+
+
+class FieldIndex:
+    def __init__(self):
+        self.values = {}        # id -> 小写后的字段值
+        self.exact = {}         # 小写值 -> ids
+        self.grams = {}         # 三元组 -> ids
+        self.short_values = {}  # 长度不足三个字符的值 -> ids
+        self.owned = None       # 副本中已复制过的 (表名, 键)；None 表示所有集合都可以原地修改
+
+    def copy(self):
+        other = FieldIndex()
+        other.values = dict(self.values)
+        other.exact = dict(self.exact)
+        other.grams = dict(self.grams)
+        other.short_values = dict(self.short_values)
+        other.owned = set()
+        self.owned = set()  # 集合已与副本共享，原索引以后也不能原地修改
+        return other
+
+    def writable(self, name, key):
+        # 返回可以原地修改的集合：共享的集合第一次修改前先复制
+        mapping = getattr(self, name)
+        ids = mapping.get(key)
+        if self.owned is None:
+            if ids is None:
+                ids = mapping[key] = set()
+            return ids
+        if (name, key) not in self.owned:
+            ids = mapping[key] = set(ids or ())
+            self.owned.add((name, key))
+        return ids
+
+    def add(self, repo_id, text):
+        if text is None:
+            return
+        value = text.lower()
+        self.values[repo_id] = value
+        self.writable('exact', value).add(repo_id)
+        if len(value) < RepoSearchIndex.GRAM_SIZE:
+            self.writable('short_values', value).add(repo_id)
+            return
+        for gram in self.ngrams(value):
+            self.writable('grams', gram).add(repo_id)
+
+    def remove(self, repo_id, text):
+        value = self.values.pop(repo_id, None)
+        if value is None:
+            return
+        self.discard('exact', value, repo_id)
+        if len(value) < RepoSearchIndex.GRAM_SIZE:
+            self.discard('short_values', value, repo_id)
+            return
+        for gram in self.ngrams(value):
+            self.discard('grams', gram, repo_id)
+
+    def discard(self, name, key, repo_id):
+        mapping = getattr(self, name)
+        if key not in mapping:
+            return
+        ids = self.writable(name, key)
+        ids.discard(repo_id)
+        if not ids:
+            del mapping[key]
+
+    @staticmethod
+    def ngrams(value):
+        size = RepoSearchIndex.GRAM_SIZE
+        return {value[i:i + size] for i in range(len(value) - size + 1)}
+
+    def search(self, search_text):
+        exact = set(self.exact.get(search_text, ()))
+        if not search_text:
+            return exact, set(self.values)
+
+        # 长度不足三个字符的值无法进入三元组索引，直接逐个比较
+        partial = set()
+        for value, ids in self.short_values.items():
+            if search_text in value:
+                partial |= ids
+
+        if len(search_text) < RepoSearchIndex.GRAM_SIZE:
+            # 短查询：任何长度 >= 3 的值若包含它，必然有某个三元组包含它
+            for gram, ids in self.grams.items():
+                if search_text in gram:
+                    partial |= ids
+            return exact, partial
+
+        # 长查询：取查询中所有三元组倒排表的交集，再核对候选
+        postings = []
+        for gram in self.ngrams(search_text):
+            ids = self.grams.get(gram)
+            if not ids:
+                return exact, partial
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates &= ids
+            if not candidates:
+                break
+        values = self.values
+        partial |= {repo_id for repo_id in candidates if search_text in values[repo_id]}
+        return exact, partial
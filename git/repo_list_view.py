@@ -0,0 +1,182 @@
+from PyQt6 import QtWidgets, QtCore, QtGui
+import bisect
+import re
+
+
+class RepoListModel(QtCore.QAbstractListModel):
+    RepoRole = QtCore.Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.repos = []
+        self.sort_keys = None  # 使用 insert_sorted 时与 repos 对应的排序键
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.repos)
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.repos):
+            return None
+        repo = self.repos[index.row()]
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return repo.get('full_name') or repo.get('name')
+        if role == QtCore.Qt.ItemDataRole.ToolTipRole:
+            return repo.get('html_url')
+        if role == self.RepoRole:
+            return repo
+        return None
+
+    def set_repos(self, repos, key=None):
+        self.beginResetModel()
+        self.repos = list(repos)
+        self.sort_keys = [key(repo) for repo in self.repos] if key else None
+        self.endResetModel()
+
+    def insert_sorted(self, repos, key):
+        # 列表已按 key 升序排列时，把新仓库二分插入到各自的位置，已显示的行保持不动
+        if self.sort_keys is None:
+            self.sort_keys = [key(repo) for repo in self.repos]
+        for repo in repos:
+            repo_key = key(repo)
+            row = bisect.bisect_right(self.sort_keys, repo_key)
+            self.beginInsertRows(QtCore.QModelIndex(), row, row)
+            self.repos.insert(row, repo)
+            self.sort_keys.insert(row, repo_key)
+            self.endInsertRows()
+
+    def remove_sorted(self, repos, key):
+        # insert_sorted 的逆操作：按排序键二分找到行并删除
+        if self.sort_keys is None:
+            self.sort_keys = [key(repo) for repo in self.repos]
+        for repo in repos:
+            row = bisect.bisect_left(self.sort_keys, key(repo))
+            if row < len(self.repos) and self.repos[row]['id'] == repo['id']:
+                self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+                del self.repos[row]
+                del self.sort_keys[row]
+                self.endRemoveRows()
+
+    def clear(self):
+        self.set_repos([])
+
+    def repo_at(self, row):
+        if 0 <= row < len(self.repos):
+            return self.repos[row]
+        return None
+
+
+class RepoItemDelegate(QtWidgets.QStyledItemDelegate):
+    # 只绘制可见行，代替每个仓库一个 QWidget 卡片
+
+    def __init__(self, parent=None, title_key='name', stats_func=None, show_language=True):
+        super().__init__(parent)
+        self.title_key = title_key
+        self.stats_func = stats_func or self.default_stats
+        self.show_language = show_language
+        self.search_text = ""
+
+    @staticmethod
+    def default_stats(repo):
+        return f"星标: {repo.get('stargazers_count', 0)} | 复刻: {repo.get('forks_count', 0)}"
+
+    def sizeHint(self, option, index):
+        line_height = option.fontMetrics.height()
+        return QtCore.QSize(option.rect.width(), line_height * 4 + 22)
+
+    def paint(self, painter, option, index):
+        repo = index.data(RepoListModel.RepoRole)
+        if repo is None:
+            return
+
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+
+        card = option.rect.adjusted(5, 3, -5, -3)
+        selected = bool(option.state & QtWidgets.QStyle.StateFlag.State_Selected)
+        painter.setPen(QtCore.Qt.PenStyle.NoPen)
+        painter.setBrush(QtGui.QColor("#e6f3ff" if selected else "white"))
+        painter.drawRoundedRect(QtCore.QRectF(card), 5, 5)
+
+        content = card.adjusted(8, 5, -8, -5)
+        base_font = QtGui.QFont(option.font)
+        line_height = option.fontMetrics.height()
+
+        # 第一行：名称（加粗）和语言
+        title_font = QtGui.QFont(base_font)
+        title_font.setBold(True)
+        title_rect = QtCore.QRect(content.left(), content.top(), content.width(), line_height)
+        if self.show_language:
+            language = f"语言: {repo.get('language') or '未知'}"
+            language_width = QtGui.QFontMetrics(base_font).horizontalAdvance(language) + 10
+            language_rect = QtCore.QRect(content.right() - language_width, content.top(), language_width, line_height)
+            self.draw_text(painter, language_rect, language, base_font, QtGui.QColor("black"),
+                           QtCore.Qt.AlignmentFlag.AlignRight)
+            title_rect.setRight(language_rect.left() - 5)
+        self.draw_text(painter, title_rect, repo.get(self.title_key) or '', title_font, QtGui.QColor("black"))
+
+        # 第二行：链接
+        small_font = QtGui.QFont(base_font)
+        small_font.setPointSizeF(max(base_font.pointSizeF() - 2, 7))
+        url_rect = QtCore.QRect(content.left(), title_rect.bottom() + 2, content.width(), line_height)
+        self.draw_text(painter, url_rect, repo.get('html_url') or '', small_font, QtGui.QColor("#0366d6"), highlight=False)
+
+        # 第三行：描述
+        description_rect = QtCore.QRect(content.left(), url_rect.bottom() + 2, content.width(), line_height)
+        self.draw_text(painter, description_rect, repo.get('description') or "No description", base_font,
+                       QtGui.QColor("black"))
+
+        # 第四行：统计信息
+        stats_rect = QtCore.QRect(content.left(), description_rect.bottom() + 2, content.width(), line_height)
+        self.draw_text(painter, stats_rect, self.stats_func(repo), small_font, QtGui.QColor("#666"),
+                       QtCore.Qt.AlignmentFlag.AlignRight, highlight=False)
+
+        painter.restore()
+
+    def draw_text(self, painter, rect, text, font, color, alignment=QtCore.Qt.AlignmentFlag.AlignLeft, highlight=True):
+        metrics = QtGui.QFontMetrics(font)
+        text = metrics.elidedText(text, QtCore.Qt.TextElideMode.ElideRight, rect.width())
+        painter.setFont(font)
+
+        x = rect.left()
+        if alignment == QtCore.Qt.AlignmentFlag.AlignRight:
+            x = rect.right() - metrics.horizontalAdvance(text)
+        baseline = rect.top() + metrics.ascent()
+
+        # 按搜索词把文本切成若干段，匹配的段落加黄色背景
+        segments = [(text, False)]
+        if highlight and self.search_text:
+            segments = []
+            last = 0
+            for match in re.finditer(re.escape(self.search_text), text, re.IGNORECASE):
+                if match.start() > last:
+                    segments.append((text[last:match.start()], False))
+                segments.append((match.group(), True))
+                last = match.end()
+            if last < len(text):
+                segments.append((text[last:], False))
+
+        for segment, matched in segments:
+            width = metrics.horizontalAdvance(segment)
+            if matched:
+                painter.fillRect(QtCore.QRect(x, rect.top(), width, metrics.height()), QtGui.QColor("yellow"))
+            painter.setPen(color)
+            painter.drawText(x, baseline, segment)
+            x += width
+
+
+def create_repo_list_view(model, delegate, parent=None):
+    view = QtWidgets.QListView(parent)
+    view.setModel(model)
+    view.setItemDelegate(delegate)
+    view.setUniformItemSizes(True)
+    view.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+    view.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollMode.ScrollPerPixel)
+    view.setStyleSheet("""
+        QListView {
+            background-color: #f0f0f0;
+            border: none;
+        }
+    """)
+    return view
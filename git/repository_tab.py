@@ -3,31 +3,57 @@ import aiohttp
 import asyncio
 import webbrowser
 from .search_widget import SearchWidget  # 导入新创建的 SearchWidget
+from .http_cache import http_cache
+from .upload_pipeline import UploadPipeline, format_bytes
+from .archive_extract import extract_zipball, safe_target
+from .clone_manifest import MANIFEST_NAME, load_manifest, save_manifest, diff_files, clear_update_targets, is_inside
+from .request_scheduler import PRIORITY_BULK
+from .git_data import GitDataApi, GitDataError, blob_entry, deletion_entry, git_blob_sha
+from .repo_index import RepoSearchIndex
+from .repo_list_view import RepoListModel, RepoItemDelegate, create_repo_list_view
+from .bulk_operations import BulkOperationEngine, OPERATION_NAMES, load_create_manifest, format_report
+from .mirror import MirrorIndex, MirrorResult, ThroughputLimiter, format_mirror_report, write_mirror_report
 import os
 import base64
-import requests
-import zipfile
-import io
 import shutil
 import re
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RepoListError(Exception):
+    # 仓库列表有页面获取失败；此时不使用不完整的列表，保留之前的结果
+    pass
+
 
 class RepositoryTab(QtWidgets.QWidget):
     repo_info_updated = QtCore.pyqtSignal(dict)
-    update_repo_list_signal = QtCore.pyqtSignal(list)
-    add_repo_widget_signal = QtCore.pyqtSignal(dict)
+    filter_results_ready = QtCore.pyqtSignal(int, str, list)
+    bulk_finished = QtCore.pyqtSignal(str, list)
 
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
+        self.tasks = main_window.tasks
         self.current_username = None
         self.current_token = None
         self.selected_repo = None
         self.all_repos = []  # 初始化为空列表
+        self.repo_index = RepoSearchIndex()  # all_repos 的搜索索引
+        self.filter_executor = ThreadPoolExecutor(max_workers=1)  # 在后台线程中过滤仓库
         self.progress_dialog = None
         self.current_search_text = ""
+        self.max_page_concurrency = 8  # 并发获取仓库分页的最大数量
+        self.page_retries = 2  # 仓库分页获取失败后的重试次数
+        self.upload_workers = 4  # 并发上传文件的 worker 数量
+        self.extract_workers = 4  # 并行解压克隆压缩包的线程数量
+        self.bulk_workers = 4  # 批量操作仓库时的并发数
+        self.mirror_workers = 3  # 镜像账号时同时下载的仓库数量
+        self.mirror_max_mb_per_second = 0  # 镜像时磁盘写入速度上限（MB/s），0 表示不限制
         self.init_ui()
-        self.update_repo_list_signal.connect(self._update_repo_list)
-        self.add_repo_widget_signal.connect(self._add_repo_widget)
+        self.filter_results_ready.connect(self._on_filter_results)
+        self.bulk_finished.connect(self._on_bulk_finished)
 
     def init_ui(self):
         layout = QtWidgets.QVBoxLayout()
@@ -35,34 +61,20 @@ class RepositoryTab(QtWidgets.QWidget):
         # 添加搜索框和搜索选项
         search_layout = QtWidgets.QHBoxLayout()
         self.search_widget = SearchWidget()
-        self.search_widget.search_changed.connect(self.filter_repos)
+        self.search_widget.search_changed.connect(self.apply_filter)
         search_layout.addWidget(self.search_widget)
 
         layout.addLayout(search_layout)
 
-        # 创一个滚动区域
-        self.scroll_area = QtWidgets.QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.scroll_area.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                background-color: #f0f0f0;
-                border: none;
-            }
-            QScrollArea > QWidget > QWidget {
-                background-color: #f0f0f0;
-            }
-        """)
-
-        # 创建一个widget来包含所有仓库项目
-        self.repo_container = QtWidgets.QWidget()
-        self.repo_layout = QtWidgets.QVBoxLayout(self.repo_container)
-        self.repo_layout.setSpacing(5)  # 减小仓库项目之间的间距
-        self.repo_layout.setContentsMargins(5, 5, 5, 5)  # 减小边距
-        self.scroll_area.setWidget(self.repo_container)
-
-        layout.addWidget(self.scroll_area)
+        # 仓库列表使用 model/view，只绘制可见的行
+        self.repo_model = RepoListModel(self)
+        self.repo_delegate = RepoItemDelegate(self)
+        self.repo_view = create_repo_list_view(self.repo_model, self.repo_delegate)
+        # 按住 Ctrl/Shift 可以多选，用于批量操作
+        self.repo_view.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.repo_view.selectionModel().selectionChanged.connect(self.on_repo_selection_changed)
+        self.repo_view.doubleClicked.connect(self.open_repo_url)
+        layout.addWidget(self.repo_view)
 
         # 修改路径布局，添加上传按钮
         path_layout = QtWidgets.QHBoxLayout()
@@ -72,11 +84,23 @@ class RepositoryTab(QtWidgets.QWidget):
         file_button = QtWidgets.QPushButton("选择文件")
         folder_button = QtWidgets.QPushButton("选择文件夹")
         upload_button = QtWidgets.QPushButton("上传到GitHub")
+        self.single_commit_checkbox = QtWidgets.QCheckBox("单次提交")
+        self.single_commit_checkbox.setToolTip("通过 Git Data API 把所有文件合并为一个提交上传")
+        self.single_commit_checkbox.setChecked(True)
+        self.sync_checkbox = QtWidgets.QCheckBox("仅上传变化")
+        self.sync_checkbox.setToolTip("与远程目录树比较 blob SHA，跳过内容未变化的文件")
+        self.sync_checkbox.setChecked(True)
+        self.delete_missing_checkbox = QtWidgets.QCheckBox("删除远程多余文件")
+        self.delete_missing_checkbox.setToolTip("删除远程目录中本地已不存在的文件")
+        self.sync_checkbox.toggled.connect(self.delete_missing_checkbox.setEnabled)
         
         path_layout.addWidget(path_label)
         path_layout.addWidget(self.path_input)
         path_layout.addWidget(file_button)
         path_layout.addWidget(folder_button)
+        path_layout.addWidget(self.single_commit_checkbox)
+        path_layout.addWidget(self.sync_checkbox)
+        path_layout.addWidget(self.delete_missing_checkbox)
         path_layout.addWidget(upload_button)
         
         layout.addLayout(path_layout)
@@ -99,11 +123,28 @@ class RepositoryTab(QtWidgets.QWidget):
         self.delete_repo_button.clicked.connect(self.delete_selected_repo)
         button_layout.addWidget(self.delete_repo_button)
 
+        # 批量操作菜单，作用于所有选中的仓库
+        self.bulk_button = QtWidgets.QPushButton("批量操作")
+        bulk_menu = QtWidgets.QMenu(self.bulk_button)
+        bulk_menu.addAction("归档", lambda: self.bulk_selected('archive'))
+        bulk_menu.addAction("设为私有", lambda: self.bulk_selected('visibility', private=True))
+        bulk_menu.addAction("设为公开", lambda: self.bulk_selected('visibility', private=False))
+        bulk_menu.addAction("设置主题...", self.bulk_set_topics)
+        bulk_menu.addSeparator()
+        bulk_menu.addAction("从清单创建仓库...", self.bulk_create_from_manifest)
+        self.bulk_button.setMenu(bulk_menu)
+        button_layout.addWidget(self.bulk_button)
+
         # 添加克隆仓库按钮
         self.clone_button = QtWidgets.QPushButton("克隆选中的仓库")
         self.clone_button.clicked.connect(self.clone_selected_repo)
         button_layout.addWidget(self.clone_button)
 
+        # 把账号下所有仓库镜像到本地，只下载上次镜像之后有推送的仓库
+        self.mirror_button = QtWidgets.QPushButton("镜像所有仓库")
+        self.mirror_button.clicked.connect(self.mirror_all_repos)
+        button_layout.addWidget(self.mirror_button)
+
         # 移除 GitHub 搜索按钮
         # self.github_search_button = QtWidgets.QPushButton("搜索 GitHub")
         # self.github_search_button.clicked.connect(self.open_github_search)
@@ -120,177 +161,218 @@ class RepositoryTab(QtWidgets.QWidget):
 
     def filter_repos(self, search_text, search_option):
         self.current_search_text = search_text
-        filtered_repos = SearchWidget.filter_repos(self.all_repos, search_text, search_option)
-        return filtered_repos if filtered_repos is not None else []
+        return self.repo_index.filter_repos(search_text, search_option)
+
+    async def set_all_repos(self, repos):
+        # 在事件循环线程中调用：索引在过滤线程中构建（大量仓库时需要几秒，不能阻塞其他网络任务），
+        # 建好后回到界面线程整体替换，与 add_repos 等方法一样只在界面线程修改
+        loop = asyncio.get_running_loop()
+        repo_index = await loop.run_in_executor(self.filter_executor, RepoSearchIndex, repos)
+        self.tasks.post(self.apply_all_repos, repos, repo_index)
+
+    def apply_all_repos(self, repos, repo_index):
+        self.all_repos = repos
+        self.repo_index = repo_index
+        self._update_repo_list(repos)
+
+    # 以下三个方法只在界面线程调用；后台线程中的过滤可能正在读旧索引，所以修改副本后整体替换
+    def add_repos(self, repos):
+        repos = list(repos)
+        repo_index = self.repo_index.copy()
+        repo_index.add_repos(repos)
+        self.all_repos = self.all_repos + repos
+        self.repo_index = repo_index
+
+    def remove_repos(self, repo_ids):
+        repo_ids = set(repo_ids)
+        repo_index = self.repo_index.copy()
+        for repo_id in repo_ids:
+            repo_index.remove_repo(repo_id)
+        self.all_repos = [repo for repo in self.all_repos if repo['id'] not in repo_ids]
+        self.repo_index = repo_index
+
+    def update_repos(self, repos):
+        updated = {repo['id']: repo for repo in repos}
+        repo_index = self.repo_index.copy()
+        for repo in repos:
+            repo_index.update_repo(repo)
+        self.all_repos = [updated.get(repo['id'], repo) for repo in self.all_repos]
+        self.repo_index = repo_index
 
     def refresh_repos(self):
         if self.current_token:
             self.create_progress_dialog("刷新仓库", "正在获取仓库列表...")
-            asyncio.get_event_loop().call_soon_threadsafe(
-                lambda: asyncio.create_task(self.fetch_all_repos_async(self.current_token))
-            )
+            token = self.current_token
+            self.tasks.submit(lambda: self.fetch_all_repos_async(token), kind='refresh',
+                              on_error=self.on_task_failed)
             self.main_window.log_message("开始刷新仓库列表")  # 修改这行
         else:
             QtWidgets.QMessageBox.warning(self, "错误", "请先登录")
-            self.main_window.log_message("尝试刷新仓库列表失败：未登录")  # 修改这行
+            self.main_window.log_message("尝试刷新仓库列表失败：未登录", "WARNING")  # 修改这行
 
-    def _update_repo_list(self, repos):
-        print(f"开始更新仓库列表，共 {len(repos)} 个仓库")
-        # 清除现有的仓库项目
-        while self.repo_layout.count():
-            item = self.repo_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+    def apply_filter(self, search_text, search_option):
+        if not search_text:
+            self.current_search_text = ""
+            self.show_repos(self.all_repos)
+            return
 
-        # 添加过滤后的仓库
-        for repo in repos:
-            self.add_repo_widget_signal.emit(repo)
+        # 记下提交时的搜索代数，结果返回时若输入已变化则直接丢弃
+        generation = self.search_widget.generation
+        repo_index = self.repo_index
 
-        # 添加一个弹性空间到布局的末尾
-        self.repo_layout.addStretch()
+        def run_filter():
+            if not self.search_widget.is_current(generation):
+                return
+            results = repo_index.filter_repos(search_text, search_option)
+            self.filter_results_ready.emit(generation, search_text, results)
 
-        # 更新搜索结果计数
-        self.search_widget.set_result_count(len(repos))
+        self.filter_executor.submit(run_filter)
+
+    @QtCore.pyqtSlot(int, str, list)
+    def _on_filter_results(self, generation, search_text, repos):
+        if not self.search_widget.is_current(generation):
+            return
+        self.current_search_text = search_text
+        self.show_repos(repos)
+
+    def _update_repo_list(self, repos):
+        print(f"开始更新仓库列表，共 {len(repos)} 个仓库")
+        if self.current_search_text:
+            self.apply_filter(self.current_search_text, self.search_widget.search_options.currentText())
+        else:
+            self.show_repos(repos)
         print("仓库列表更新完成")
 
+    def show_repos(self, repos):
+        self.repo_delegate.search_text = self.current_search_text
+        self.repo_model.set_repos(repos)
+        # 列表重置后恢复之前选中的仓库
+        if self.selected_repo:
+            for row, repo in enumerate(self.repo_model.repos):
+                if repo['name'] == self.selected_repo:
+                    self.repo_view.setCurrentIndex(self.repo_model.index(row))
+                    break
+        self.search_widget.set_result_count(len(repos))
+
     def update_search_count(self, count):
         self.search_widget.set_result_count(count)
 
-    @QtCore.pyqtSlot(dict)
-    def _add_repo_widget(self, repo):
-        repo_widget = self.create_repo_widget(repo)
-        self.repo_layout.addWidget(repo_widget)
-
-    def create_repo_widget(self, repo):
-        widget = QtWidgets.QWidget()
-        widget.setStyleSheet("""
-            QWidget {
-                background-color: white;
-                border-radius: 5px;
-                padding: 5px;
-            }
-        """)
-        layout = QtWidgets.QVBoxLayout()
-        layout.setSpacing(2)  # 减小垂直间距
-        layout.setContentsMargins(5, 5, 5, 5)  # 减小边距
-        
-        # 创建一个水平布局来包含名称和语言
-        top_layout = QtWidgets.QHBoxLayout()
-        
-        name_label = QtWidgets.QLabel(SearchWidget.highlight_text(repo['name'], self.current_search_text))
-        name_label.setTextFormat(QtCore.Qt.TextFormat.RichText)
-        name_label.setStyleSheet("font-weight: bold;")
-        top_layout.addWidget(name_label)
-        
-        language_label = QtWidgets.QLabel(f"语言: {SearchWidget.highlight_text(repo['language'] or '未知', self.current_search_text)}")
-        language_label.setTextFormat(QtCore.Qt.TextFormat.RichText)
-        language_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
-        top_layout.addWidget(language_label)
-        
-        layout.addLayout(top_layout)
-        
-        url_label = QtWidgets.QLabel(f"<a href='{repo['html_url']}'>{repo['html_url']}</a>")
-        url_label.setOpenExternalLinks(True)
-        url_label.setStyleSheet("font-size: 8pt;")
-        layout.addWidget(url_label)
-        
-        description_label = QtWidgets.QLabel(SearchWidget.highlight_text(repo['description'] or "No description", self.current_search_text))
-        description_label.setTextFormat(QtCore.Qt.TextFormat.RichText)
-        description_label.setWordWrap(True)
-        description_label.setStyleSheet("font-size: 9pt;")
-        layout.addWidget(description_label)
-        
-        # 创建一个标签来包含统计信息
-        stats_label = QtWidgets.QLabel(f"星标: {repo['stargazers_count']} | 复刻: {repo['forks_count']}")
-        stats_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
-        stats_label.setStyleSheet("font-size: 8pt; color: #666;")
-        layout.addWidget(stats_label)
-        
-        widget.setLayout(layout)
-        widget.repo_name = repo['name']  # 存储仓库名称
-        widget.clone_url = repo['clone_url']  # 存储克隆 URL
-        widget.mousePressEvent = lambda event: self.toggle_repo_selection(widget)
-        
-        return widget
-
-    def toggle_repo_selection(self, widget):
-        if self.selected_repo == widget.repo_name:
-            self.selected_repo = None
-            widget.setStyleSheet("""
-                QWidget {
-                    background-color: white;
-                    border-radius: 5px;
-                    padding: 10px;
-                }
-            """)
+    def on_repo_selection_changed(self, selected, deselected):
+        indexes = self.repo_view.selectionModel().selectedIndexes()
+        if indexes:
+            self.selected_repo = self.repo_model.repo_at(indexes[0].row())['name']
         else:
-            if self.selected_repo:
-                # 取消之前选中的仓库的高
-                for i in range(self.repo_layout.count()):
-                    item = self.repo_layout.itemAt(i)
-                    if item.widget() and item.widget().repo_name == self.selected_repo:
-                        item.widget().setStyleSheet("""
-                            QWidget {
-                                background-color: white;
-                                border-radius: 5px;
-                                padding: 10px;
-                            }
-                        """)
-                        break
-            self.selected_repo = widget.repo_name
-            widget.setStyleSheet("""
-                QWidget {
-                    background-color: #e6f3ff;
-                    border-radius: 5px;
-                    padding: 10px;
-                }
-            """)
+            self.selected_repo = None
+
+    def selected_repo_data(self):
+        indexes = self.repo_view.selectionModel().selectedIndexes()
+        if not indexes:
+            return None
+        return self.repo_model.repo_at(indexes[0].row())
+
+    def selected_repos_data(self):
+        rows = sorted(index.row() for index in self.repo_view.selectionModel().selectedIndexes())
+        return [self.repo_model.repo_at(row) for row in rows]
+
+    def open_repo_url(self, index):
+        repo = self.repo_model.repo_at(index.row())
+        if repo:
+            webbrowser.open(repo['html_url'])
 
     @QtCore.pyqtSlot(str)
     def fetch_repos(self, token):
-        asyncio.create_task(self.fetch_all_repos_async(token))
+        self.tasks.submit(lambda: self.fetch_all_repos_async(token), kind='refresh', on_error=self.on_task_failed)
 
     async def fetch_all_repos_async(self, token):
         print("开始获取仓库列表")
+        try:
+            all_repos = await self.fetch_repo_list(token)
+        except RepoListError as e:
+            self.tasks.post(self.close_progress_dialog)
+            self.tasks.post(self.main_window.log_message, f"刷新仓库列表失败: {str(e)}", "WARNING")
+            self.tasks.post(self.show_warning_message, "刷新失败", f"{str(e)}，已保留之前的仓库列表")
+            return
+        print(f"获取到 {len(all_repos)} 个仓库")
+        await self.set_all_repos(all_repos)
+        print("已提交仓库列表更新")
+        self.tasks.post(self.close_progress_dialog)
+
+    async def fetch_repo_list(self, token):
         headers = {'Authorization': f'token {token}'}
-        all_repos = []
-        page = 1
         per_page = 100
+        pages = {}
+
+        session = await self.main_window.http_client.get_session()
+        # 先请求第一页，从 Link 头的 rel="last" 中读取总页数
+        repos, last_page = await self.fetch_repo_page(session, headers, 1, per_page)
+        if repos is None:
+            raise RepoListError("获取第 1 页仓库失败")
+        pages[1] = repos
+        self.report_progress(1, last_page)
+
+        # 剩余页面并发获取，并发数由 max_page_concurrency 限制；失败的页面再重试，仍然失败则放弃整个列表
+        semaphore = asyncio.Semaphore(self.max_page_concurrency)
+        done = [1]
+
+        async def fetch_page(page):
+            async with semaphore:
+                page_repos, _ = await self.fetch_repo_page(session, headers, page, per_page)
+            if page_repos is not None:
+                pages[page] = page_repos
+                done[0] += 1
+                self.report_progress(done[0], last_page)
+
+        missing = list(range(2, last_page + 1))
+        for attempt in range(self.page_retries + 1):
+            if not missing:
+                break
+            if attempt:
+                await asyncio.sleep(attempt)
+            await asyncio.gather(*(fetch_page(page) for page in missing))
+            missing = [page for page in missing if page not in pages]
+        if missing:
+            raise RepoListError(f"{len(missing)} 页仓库获取失败（第 {', '.join(map(str, missing[:10]))} 页）")
+
+        # 按页码顺序合并结果
+        all_repos = []
+        for page in sorted(pages):
+            all_repos.extend(pages[page])
+        return all_repos
 
-        async with aiohttp.ClientSession() as session:
-            while True:
-                try:
-                    url = f'https://api.github.com/user/repos?page={page}&per_page={per_page}'
-                    async with session.get(url, headers=headers) as response:
-                        if response.status == 200:
-                            repos = await response.json()
-                            if not repos:
-                                break
-                            all_repos.extend(repos)
-                            page += 1
-                            QtCore.QMetaObject.invokeMethod(self, "update_progress_dialog",
-                                                            QtCore.Qt.ConnectionType.QueuedConnection,
-                                                            QtCore.Q_ARG(int, len(all_repos)),
-                                                            QtCore.Q_ARG(int, len(all_repos) + per_page))
-                        else:
-                            break
-                except aiohttp.ClientError:
-                    break
-
-        print(f"获取到 {len(all_repos)} 个仓库")
-        self.all_repos = all_repos
-        self.update_repo_list_signal.emit(all_repos)
-        print("发送更新信号")
-        QtCore.QMetaObject.invokeMethod(self, "close_progress_dialog",
-                                        QtCore.Qt.ConnectionType.QueuedConnection)
-
-    def get_event_loop(self):
+    async def fetch_repo_page(self, session, headers, page, per_page):
+        # 返回 (仓库列表, 总页数)，请求失败时仓库列表为 None
+        url = f'https://api.github.com/user/repos?page={page}&per_page={per_page}'
         try:
-            return asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            return loop
+            response = await http_cache.get(session, url, headers=headers)
+            if response.status != 200:
+                print(f"获取第 {page} 页仓库失败: {response.status}")
+                return None, 0
+            return response.data, self.parse_last_page(response.headers.get('Link'), page)
+        except aiohttp.ClientError as e:
+            print(f"获取第 {page} 页仓库时出错: {str(e)}")
+            return None, 0
+
+    @staticmethod
+    def parse_last_page(link_header, default):
+        # 解析形如 <https://api.github.com/user/repos?page=5&per_page=100>; rel="last" 的 Link 头
+        if not link_header:
+            return default
+        for part in link_header.split(','):
+            match = re.search(r'<([^>]*)>\s*;\s*rel="last"', part)
+            if match:
+                page_match = re.search(r'[?&]page=(\d+)', match.group(1))
+                if page_match:
+                    return int(page_match.group(1))
+        return default
+
+    def report_progress(self, done, total):
+        self.tasks.post(self.update_progress_dialog, done, total, key='progress')
+
+    def on_task_failed(self, error):
+        # 后台任务抛出未处理的异常时关闭进度框并提示
+        self.close_progress_dialog()
+        self.main_window.log_message(f"后台任务出错: {type(error).__name__}: {error}", "ERROR")
+        QtWidgets.QMessageBox.warning(self, "错误", f"操作失败: {str(error)}")
 
     def create_new_repo(self):
         if not self.current_token:
@@ -303,17 +385,13 @@ class RepositoryTab(QtWidgets.QWidget):
             description = dialog.description.toPlainText()
             is_private = dialog.private_checkbox.isChecked()
             with_readme = dialog.readme_checkbox.isChecked()
-            asyncio.get_event_loop().call_soon_threadsafe(
-                lambda: asyncio.create_task(self.create_repo_async(repo_name, description, is_private, with_readme))
-            )
+            self.tasks.submit(lambda: self.create_repo_async(repo_name, description, is_private, with_readme),
+                              kind='create', on_error=self.on_task_failed)
 
     async def create_repo_async(self, name, description, private, with_readme):
         # 首先检查仓库名是否已存在
         if await self.check_repo_exists(name):
-            QtCore.QMetaObject.invokeMethod(self, "show_warning_message",
-                                            QtCore.Qt.ConnectionType.QueuedConnection,
-                                            QtCore.Q_ARG(str, "错"),
-                                            QtCore.Q_ARG(str, f"仓库名 '{name}' 已存在"))
+            self.tasks.post(self.show_warning_message, "错", f"仓库名 '{name}' 已存在")
             return
 
         headers = {'Authorization': f'token {self.current_token}'}
@@ -323,45 +401,50 @@ class RepositoryTab(QtWidgets.QWidget):
             "private": private,
             "auto_init": with_readme
         }
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post('https://api.github.com/user/repos', headers=headers, json=data) as response:
-                    if response.status == 201:
-                        QtCore.QMetaObject.invokeMethod(self, "show_info_message",
-                                                        QtCore.Qt.ConnectionType.QueuedConnection,
-                                                        QtCore.Q_ARG(str, "成功"),
-                                                        QtCore.Q_ARG(str, f"仓库 '{name}' 创建成功"))
-                        await self.fetch_all_repos_async(self.current_token)
-                    else:
-                        error_msg = await response.text()
-                        QtCore.QMetaObject.invokeMethod(self, "show_warning_message",
-                                                        QtCore.Qt.ConnectionType.QueuedConnection,
-                                                        QtCore.Q_ARG(str, "错误"),
-                                                        QtCore.Q_ARG(str, f"创建仓库失败: {error_msg}"))
-            except aiohttp.ClientError as e:
-                QtCore.QMetaObject.invokeMethod(self, "show_warning_message",
-                                                QtCore.Qt.ConnectionType.QueuedConnection,
-                                                QtCore.Q_ARG(str, "错"),
-                                                QtCore.Q_ARG(str, f"创建仓库时发生错误: {str(e)}"))
+        session = await self.main_window.http_client.get_session()
+        created = None
+        try:
+            async with session.post('https://api.github.com/user/repos', headers=headers, json=data) as response:
+                if response.status == 201:
+                    created = await response.json()
+                    self.tasks.post(self.show_info_message, "成功", f"仓库 '{name}' 创建成功")
+                else:
+                    error_msg = await response.text()
+                    self.tasks.post(self.show_warning_message, "错误", f"创建仓库失败: {error_msg}")
+        except aiohttp.ClientError as e:
+            self.tasks.post(self.show_warning_message, "错", f"创建仓库时发生错误: {str(e)}")
+
+        # 新仓库直接加入列表，不再重新获取整个账号的仓库；列表和索引只在界面线程中修改
+        if created:
+            self.tasks.post(self.on_repo_created, created)
+
+    def on_repo_created(self, repo):
+        self.add_repos([repo])
+        self._update_repo_list(self.all_repos)
 
     async def check_repo_exists(self, name):
         headers = {'Authorization': f'token {self.current_token}'}
-        async with aiohttp.ClientSession() as session:
-            try:
-                url = f'https://api.github.com/repos/{self.current_username}/{name}'
-                async with session.get(url, headers=headers) as response:
-                    return response.status == 200
-            except aiohttp.ClientError:
-                return False
+        session = await self.main_window.http_client.get_session()
+        try:
+            url = f'https://api.github.com/repos/{self.current_username}/{name}'
+            response = await http_cache.get(session, url, headers=headers)
+            return response.status == 200
+        except aiohttp.ClientError:
+            return False
 
     def delete_selected_repo(self):
-        if not self.selected_repo:
+        repos = self.selected_repos_data()
+        if not repos:
             QtWidgets.QMessageBox.warning(self, "警告", "请选择要删除的仓库")
             return
-        
+
+        if len(repos) == 1:
+            text = f'您确定要删除仓库 "{repos[0]["name"]}" 吗？\n此操作不可逆'
+        else:
+            text = f'您确定要删除选中的 {len(repos)} 个仓库吗？\n此操作不可逆'
         msg_box = QtWidgets.QMessageBox(self)
         msg_box.setWindowTitle('确认删除')
-        msg_box.setText(f'您确定要删除仓库 "{self.selected_repo}" 吗？\n此操作不可逆')
+        msg_box.setText(text)
         msg_box.setStandardButtons(QtWidgets.QMessageBox.StandardButton.Yes | QtWidgets.QMessageBox.StandardButton.No)
         msg_box.setDefaultButton(QtWidgets.QMessageBox.StandardButton.No)
         
@@ -373,28 +456,92 @@ class RepositoryTab(QtWidgets.QWidget):
         reply = msg_box.exec()
         
         if reply == QtWidgets.QMessageBox.StandardButton.Yes:
-            asyncio.get_event_loop().call_soon_threadsafe(
-                lambda: asyncio.create_task(self.delete_repos_async([self.selected_repo]))
-            )
+            self.start_bulk_operation('delete', repos)
 
-    async def delete_repos_async(self, repo_names):
+    def bulk_selected(self, operation, **params):
+        repos = self.selected_repos_data()
+        if not repos:
+            QtWidgets.QMessageBox.warning(self, "警告", "请先选择仓库")
+            return
+        self.start_bulk_operation(operation, repos, **params)
+
+    def bulk_set_topics(self):
+        repos = self.selected_repos_data()
+        if not repos:
+            QtWidgets.QMessageBox.warning(self, "警告", "请先选择仓库")
+            return
+        current = ", ".join(repos[0].get('topics') or []) if len(repos) == 1 else ""
+        text, ok = QtWidgets.QInputDialog.getText(self, "设置主题", "主题（用逗号分隔，留空清除所有主题）:", text=current)
+        if not ok:
+            return
+        # GitHub 的主题只允许小写字母、数字和连字符
+        names = [name.strip().lower().replace(' ', '-') for name in text.split(',') if name.strip()]
+        self.start_bulk_operation('topics', repos, names=names)
+
+    def bulk_create_from_manifest(self):
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "选择仓库清单", "", "JSON 文件 (*.json)")
+        if not path:
+            return
+        try:
+            specs = load_create_manifest(path)
+        except (OSError, ValueError) as e:
+            QtWidgets.QMessageBox.warning(self, "错误", f"读取清单失败: {str(e)}")
+            return
+        self.start_bulk_operation('create', specs)
+
+    def start_bulk_operation(self, operation, items, **params):
+        if not self.current_token:
+            QtWidgets.QMessageBox.warning(self, "错误", "请先登录")
+            return
+        if not items:
+            return
+        self.create_progress_dialog("批量操作", f"正在{OPERATION_NAMES[operation]} {len(items)} 个仓库...")
+        self.main_window.log_message(f"开始批量{OPERATION_NAMES[operation]} {len(items)} 个仓库")
+        self.tasks.submit(lambda: self.bulk_operation_async(operation, items, params), kind='bulk',
+                          on_error=self.on_task_failed)
+
+    async def bulk_operation_async(self, operation, items, params):
         headers = {'Authorization': f'token {self.current_token}'}
-        async with aiohttp.ClientSession() as session:
-            for repo_name in repo_names:
-                try:
-                    url = f'https://api.github.com/repos/{self.current_username}/{repo_name}'
-                    async with session.delete(url, headers=headers) as response:
-                        if response.status == 204:
-                            print(f"Successfully deleted repository: {repo_name}")
-                        else:
-                            print(f"Failed to delete repository: {repo_name}. Status: {response.status}")
-                except aiohttp.ClientError as e:
-                    print(f"Error deleting repository {repo_name}: {str(e)}")
-        
-        # 删除选中的仓库
-        self.selected_repo = None
-        # 刷新仓表
-        await self.fetch_all_repos_async(self.current_token)
+        session = await self.main_window.http_client.get_session()
+        engine = BulkOperationEngine(session, headers, self.current_username, self.bulk_workers,
+                                     on_progress=self.report_progress)
+        results = await engine.run(operation, items, **params)
+        self.bulk_finished.emit(operation, results)
+
+    async def delete_repos_async(self, repo_names):
+        # 保留原有接口：按名称删除，结果同样就地更新到列表
+        repos = [repo for repo in self.all_repos if repo['name'] in set(repo_names)]
+        await self.bulk_operation_async('delete', repos, {})
+
+    @QtCore.pyqtSlot(str, list)
+    def _on_bulk_finished(self, operation, results):
+        self.close_progress_dialog()
+        self.apply_bulk_results(operation, results)
+
+        summary, details = format_report(operation, results)
+        failed = any(not result.ok for result in results)
+        self.main_window.log_message(summary, "WARNING" if failed else "INFO")
+        msg_box = QtWidgets.QMessageBox(self)
+        msg_box.setWindowTitle("批量操作结果")
+        msg_box.setIcon(QtWidgets.QMessageBox.Icon.Warning if failed else QtWidgets.QMessageBox.Icon.Information)
+        msg_box.setText(summary)
+        msg_box.setDetailedText(details)
+        msg_box.exec()
+
+    def apply_bulk_results(self, operation, results):
+        # 用成功的结果就地更新 all_repos 和列表，不再重新获取整个账号的仓库
+        repos = [result.repo for result in results if result.ok and result.repo]
+        if not repos:
+            return
+        if operation == 'delete':
+            self.remove_repos(repo['id'] for repo in repos)
+            if self.selected_repo in {repo['name'] for repo in repos}:
+                self.selected_repo = None
+        elif operation == 'create':
+            self.add_repos(repos)
+        else:
+            self.update_repos(repos)
+        self._update_repo_list(self.all_repos)
 
     @QtCore.pyqtSlot(str, str)
     def show_warning_message(self, title, message):
@@ -424,117 +571,245 @@ class RepositoryTab(QtWidgets.QWidget):
             QtWidgets.QMessageBox.warning(self, "警告", "请选择要上传的文件或文件夹")
             return
 
+        single_commit = self.single_commit_checkbox.isChecked()
+        sync = self.sync_checkbox.isChecked()
+        delete_missing = sync and self.delete_missing_checkbox.isChecked()
         self.create_progress_dialog("上传文件", "正在上传文件...")
-        asyncio.get_event_loop().call_soon_threadsafe(
-            lambda: asyncio.create_task(self.upload_files_async(local_path, self.selected_repo))
-        )
+        repo_name = self.selected_repo
+        self.tasks.submit(lambda: self.upload_files_async(local_path, repo_name, single_commit, sync, delete_missing),
+                          kind='upload', on_error=self.on_task_failed)
 
-    async def upload_files_async(self, local_path, repo_name):
+    async def upload_files_async(self, local_path, repo_name, single_commit=False, sync=False, delete_missing=False):
         headers = {'Authorization': f'token {self.current_token}'}
         base_url = f'https://api.github.com/repos/{self.current_username}/{repo_name}/contents/'
 
         # 获取选择的目录名称
         dir_name = os.path.basename(local_path)
 
-        async with aiohttp.ClientSession() as session:
-            if os.path.isfile(local_path):
-                await self.upload_file(session, headers, base_url, local_path, dir_name)
-            elif os.path.isdir(local_path):
-                await self.upload_directory(session, headers, base_url, local_path, dir_name)
-        
-            if os.path.isdir(local_path) and not os.listdir(local_path):
-                # 如果选择的是个空目录，保创建它
-                await self.create_gitkeep(session, headers, base_url, dir_name)
-
-        QtCore.QMetaObject.invokeMethod(self, "close_progress_dialog",
-                                        QtCore.Qt.ConnectionType.QueuedConnection)
-        QtCore.QMetaObject.invokeMethod(self, "show_upload_status",
-                                        QtCore.Qt.ConnectionType.QueuedConnection,
-                                        QtCore.Q_ARG(str, "success"),
-                                        QtCore.Q_ARG(str, "上传完成"))
-
-    async def upload_directory(self, session, headers, base_url, dir_path, parent_dir):
-        # 首先创建父目录
-        await self.create_directory(session, headers, base_url, parent_dir)
-
-        # 然后上传所有文件和子目录
-        for root, dirs, files in os.walk(dir_path):
-            relative_root = os.path.relpath(root, dir_path)
-            current_dir = os.path.join(parent_dir, relative_root).replace(os.path.sep, '/')
-            if current_dir.endswith('.'):
-                current_dir = current_dir[:-1]
-
-            # 创当前目录
-            if current_dir != parent_dir:
-                await self.create_directory(session, headers, base_url, current_dir)
-
-            for file in files:
-                file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, dir_path)
-                github_path = os.path.join(parent_dir, relative_path).replace(os.path.sep, '/')
-                try:
-                    await self.upload_file(session, headers, base_url, file_path, github_path)
-                except Exception as e:
-                    print(f"Error uploading {github_path}: {str(e)}")
-
-        if not os.listdir(dir_path):
-            await self.create_gitkeep(session, headers, base_url, parent_dir)
-
-    async def upload_file(self, session, headers, base_url, file_path, github_path):
-        file_name = os.path.basename(file_path)
-        if file_name == 'tokens.json' or file_name.endswith('.pyc'):
+        session = await self.main_window.http_client.get_session()
+        api = GitDataApi(session, headers, self.current_username, repo_name, priority=PRIORITY_BULK)
+        try:
+            remote = None
+            if single_commit or sync:
+                remote = await self.fetch_remote_state(api, with_files=sync)
+            if single_commit and remote is not None:
+                summary, failed = await self.upload_single_commit(api, remote, local_path, dir_name, delete_missing)
+            else:
+                if single_commit:
+                    print("仓库为空，无法使用单次提交上传，改为逐个文件上传")
+                summary, failed = await self.upload_per_file(session, headers, base_url, remote,
+                                                             local_path, dir_name, delete_missing)
+        except (GitDataError, aiohttp.ClientError, OSError) as e:
+            self.tasks.post(self.close_progress_dialog)
+            self.tasks.post(self.show_upload_status, "error", f"上传失败: {str(e)}")
             return
 
+        self.tasks.post(self.close_progress_dialog)
+        message = (f"上传 {summary['uploaded']} 个文件，跳过 {summary['skipped']} 个未变化的文件，"
+                   f"删除 {summary['deleted']} 个远程文件")
+        if failed:
+            details = "\n".join(f"{path}: {error}" for path, error in failed[:20])
+            self.tasks.post(self.show_upload_status, "error", f"{message}\n{len(failed)} 个文件失败:\n{details}")
+        else:
+            self.tasks.post(self.show_upload_status, "success", f"上传完成：{message}")
+
+    def create_pipeline(self):
+        return UploadPipeline(worker_count=self.upload_workers, on_progress=self.report_upload_progress)
+
+    def report_upload_progress(self, pipeline):
+        total = pipeline.total_files if pipeline.scan_finished else f"{pipeline.total_files}+"
+        self.report_progress(pipeline.done_files, pipeline.total_files)
+        self.report_progress_text(f"已处理 {pipeline.done_files}/{total} 个文件，"
+                                  f"{format_bytes(pipeline.done_bytes)}/{format_bytes(pipeline.total_bytes)}")
+
+    async def fetch_remote_state(self, api, with_files=False):
+        # 返回默认分支的头提交和（可选的）完整文件列表；仓库为空时返回 None
+        branch = await api.get_default_branch()
         try:
-            with open(file_path, 'rb') as file:
-                content = file.read()
-        except IOError:
+            head_sha, tree_sha = await api.get_head(branch)
+        except GitDataError as e:
+            if e.status in (404, 409):
+                return None
+            raise
+
+        remote = {'branch': branch, 'head_sha': head_sha, 'tree_sha': tree_sha, 'files': None, 'complete': False}
+        if with_files:
+            tree = await api.get_tree(tree_sha, recursive=True)
+            remote['files'] = {item['path']: (item['sha'], item['mode'])
+                               for item in tree['tree'] if item['type'] == 'blob'}
+            remote['complete'] = not tree.get('truncated')
+            if not remote['complete']:
+                print("远程目录树过大被截断，无法得到完整的文件列表")
+        return remote
+
+    def missing_remote_paths(self, remote_files, local_paths, dir_name):
+        # 只考虑本次上传目录下的远程文件
+        prefix = dir_name + '/'
+        return [path for path in remote_files
+                if (path == dir_name or path.startswith(prefix))
+                and path not in local_paths and not self.should_skip_upload(path)]
+
+    async def upload_single_commit(self, api, remote, local_path, dir_name, delete_missing=False):
+        # blob -> tree -> commit -> 快进 ref，整个目录只产生一个提交
+        remote_files = remote['files'] or {}
+        local_paths = set()
+        entries = []
+
+        async def create_blob(file_path, github_path):
+            local_paths.add(github_path)
+            remote_sha, remote_mode = remote_files.get(github_path, (None, None))
+            mode = self.upload_mode(file_path, remote_mode)
+            _, encoded = await self.prepare_upload_content(file_path, remote_sha if remote_mode == mode else None)
+            if encoded is None:
+                return None, None  # 内容和权限都未变化
+            try:
+                blob_sha = await api.create_blob(None, encoded)
+            except GitDataError as e:
+                return e.status, e.headers
+            entries.append(blob_entry(github_path, blob_sha, mode=mode))
+            return 201, None
+
+        pipeline = self.create_pipeline()
+        failed = await pipeline.run(self.iter_upload_files(local_path, dir_name), create_blob)
+        if failed:
+            raise GitDataError(None, f"{len(failed)} 个文件创建 blob 失败，例如 {failed[0][0]}: {failed[0][1]}")
+
+        summary = {'uploaded': len(entries), 'skipped': pipeline.skipped_files, 'deleted': 0}
+        if delete_missing and remote['complete']:
+            missing = self.missing_remote_paths(remote_files, local_paths, dir_name)
+            entries.extend(deletion_entry(path) for path in missing)
+            summary['deleted'] = len(missing)
+
+        if not entries:
+            print("没有需要提交的变化")
+            return summary, []
+
+        self.report_progress_text("正在创建提交...")
+        tree_sha = await api.create_tree(entries, base_tree=remote['tree_sha'])
+        commit_sha = await api.create_commit(f"Upload {dir_name}", tree_sha, [remote['head_sha']])
+        await api.update_ref(remote['branch'], commit_sha)
+        print(f"已通过单次提交上传 {summary['uploaded']} 个文件，删除 {summary['deleted']} 个文件: {commit_sha}")
+        return summary, []
+
+    async def upload_per_file(self, session, headers, base_url, remote, local_path, dir_name, delete_missing=False):
+        remote_files = remote['files'] if remote else None
+        local_paths = set()
+
+        async def upload(file_path, github_path):
+            local_paths.add(github_path)
+            return await self.upload_file(session, headers, base_url, file_path, github_path, remote_files)
+
+        pipeline = self.create_pipeline()
+        failed = await pipeline.run(self.iter_upload_files(local_path, dir_name), upload)
+        summary = {'uploaded': pipeline.done_files - pipeline.skipped_files - len(failed),
+                   'skipped': pipeline.skipped_files, 'deleted': 0}
+
+        if delete_missing and remote_files is not None and remote['complete']:
+            missing = self.missing_remote_paths(remote_files, local_paths, dir_name)
+
+            async def delete(file_path, github_path):
+                return await self.delete_remote_file(session, headers, base_url, github_path,
+                                                     remote_files[github_path][0])
+
+            delete_failed = await self.create_pipeline().run(((None, path) for path in missing), delete)
+            summary['deleted'] = len(missing) - len(delete_failed)
+            failed += delete_failed
+        return summary, failed
+
+    def iter_upload_files(self, local_path, dir_name):
+        # 产出 (本地路径, 仓库内路径)，空目录用本地路径为 None 的 .gitkeep 占位
+        if os.path.isfile(local_path):
+            if not self.should_skip_upload(local_path):
+                yield local_path, dir_name
             return
 
-        encoded_content = base64.b64encode(content).decode('utf-8')
+        for root, dirs, file_names in os.walk(local_path):
+            relative_root = os.path.relpath(root, local_path)
+            github_dir = dir_name if relative_root == '.' else os.path.join(dir_name, relative_root).replace(os.path.sep, '/')
+            if not dirs and not file_names:
+                yield None, github_dir + '/.gitkeep'
+            for file_name in file_names:
+                file_path = os.path.join(root, file_name)
+                if not self.should_skip_upload(file_path):
+                    yield file_path, github_dir + '/' + file_name
+
+    @staticmethod
+    def should_skip_upload(file_path):
+        file_name = os.path.basename(file_path)
+        return file_name in ('tokens.json', MANIFEST_NAME) or file_name.endswith('.pyc')
+
+    @staticmethod
+    def is_executable(file_path):
+        return file_path is not None and os.name != 'nt' and os.access(file_path, os.X_OK)
+
+    @classmethod
+    def upload_mode(cls, file_path, remote_mode=None):
+        # Windows 上无法得知可执行位：已有文件沿用远程的模式（包括 100755 和符号链接 120000），
+        # 只比较内容；否则每次同步都会重新上传这些文件并把模式改成 100644
+        if os.name == 'nt':
+            return remote_mode or "100644"
+        return "100755" if cls.is_executable(file_path) else "100644"
+
+    @staticmethod
+    def read_upload_content(file_path):
+        if file_path is None:
+            return b""  # 空目录占位的 .gitkeep
+        with open(file_path, 'rb') as file:
+            return file.read()
+
+    async def prepare_upload_content(self, file_path, unchanged_sha=None):
+        # 在线程池中读取文件、计算 blob sha 并做 base64 编码，大文件不会阻塞事件循环；
+        # 返回 (sha, 编码后的内容)，sha 等于 unchanged_sha 时不编码，内容为 None
+        def prepare():
+            content = self.read_upload_content(file_path)
+            sha = git_blob_sha(content)
+            if sha == unchanged_sha:
+                return sha, None
+            return sha, base64.b64encode(content).decode('utf-8')
+
+        return await asyncio.get_running_loop().run_in_executor(None, prepare)
+
+    async def upload_file(self, session, headers, base_url, file_path, github_path, remote_files=None):
+        # 返回 PUT 的 (状态码, 响应头)，读不到文件或内容未变化时返回 (None, None)
+        # remote_files 为远程目录树中 {路径: (sha, mode)}，提供时不再逐个 GET 文件的 sha
+        remote_sha = remote_files[github_path][0] if remote_files and github_path in remote_files else None
+        try:
+            _, encoded_content = await self.prepare_upload_content(file_path, remote_sha)
+        except IOError:
+            return None, None
+        if encoded_content is None:
+            return None, None  # 内容未变化
+
         data = {
             "message": f"Upload {github_path}",
             "content": encoded_content
         }
 
         url = base_url + github_path
-        try:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    existing_file = await response.json()
-                    data["sha"] = existing_file["sha"]
-
-            async with session.put(url, headers=headers, json=data) as response:
-                if response.status not in [201, 200]:
-                    error_content = await response.text()
-                    print(f"Failed to upload {github_path}. Status: {response.status}, Error: {error_content}")
-        except Exception as e:
-            print(f"Error during API request for {github_path}: {str(e)}")
-
-    async def create_directory(self, session, headers, base_url, path):
-        url = base_url + path + '/.gitkeep'
-        data = {
-            "message": f"Create directory: {path}",
-            "content": base64.b64encode(b"").decode('utf-8')
-        }
-        
-        async with session.put(url, headers=headers, json=data) as response:
-            if response.status not in [201, 200, 422]:
+        if remote_files is None:
+            response = await http_cache.get(session, url, headers=headers, priority=PRIORITY_BULK)
+            if response.status == 200 and isinstance(response.data, dict):
+                data["sha"] = response.data["sha"]
+        elif remote_sha is not None:
+            data["sha"] = remote_sha
+
+        async with session.put(url, headers=headers, json=data, priority=PRIORITY_BULK) as response:
+            if response.status not in [201, 200]:
                 error_content = await response.text()
-                print(f"Failed to create directory: {path}. Status: {response.status}, Error: {error_content}")
+                print(f"Failed to upload {github_path}. Status: {response.status}, Error: {error_content}")
+            return response.status, response.headers
 
-    async def create_gitkeep(self, session, headers, base_url, relative_path):
-        relative_path = relative_path.lstrip('/')
-        url = base_url + relative_path + '.gitkeep'
+    async def delete_remote_file(self, session, headers, base_url, github_path, sha):
         data = {
-            "message": f"Create directory: {relative_path}",
-            "content": base64.b64encode(b"").decode('utf-8')
+            "message": f"Delete {github_path}",
+            "sha": sha
         }
-        
-        async with session.put(url, headers=headers, json=data) as response:
-            if response.status not in [201, 200, 422]:
+        async with session.delete(base_url + github_path, headers=headers, json=data,
+                                  priority=PRIORITY_BULK) as response:
+            if response.status != 200:
                 error_content = await response.text()
-                print(f"Failed to create directory: {relative_path}. Status: {response.status}, Error: {error_content}")
+                print(f"Failed to delete {github_path}. Status: {response.status}, Error: {error_content}")
+            return response.status, response.headers
 
     @QtCore.pyqtSlot(str, str)
     def show_upload_status(self, status, message):
@@ -548,75 +823,292 @@ class RepositoryTab(QtWidgets.QWidget):
             QtWidgets.QMessageBox.warning(self, "警告", "请先选择一个仓库")
             return
         
-        for i in range(self.repo_layout.count()):
-            item = self.repo_layout.itemAt(i)
-            if item.widget() and item.widget().repo_name == self.selected_repo:
-                self.clone_repository(item.widget().clone_url)
-                break
+        repo = self.selected_repo_data()
+        if repo:
+            self.clone_repository(repo['clone_url'], repo.get('private', True))
 
-    def clone_repository(self, clone_url):
+    def clone_repository(self, clone_url, private=True):
         # 选择克隆目录
         clone_dir = QtWidgets.QFileDialog.getExistingDirectory(self, "选择克隆目")
-        if clone_dir:
-            # 执行克隆操作
-            asyncio.get_event_loop().call_soon_threadsafe(
-                lambda: asyncio.create_task(self.clone_repo_async(clone_url, clone_dir))
-            )
+        if not clone_dir:
+            return
 
-    async def clone_repo_async(self, clone_url, clone_dir):
+        # 目标目录已存在时在界面线程询问：之前克隆过的仓库可以增量更新
+        repo_name = clone_url.split('/')[-1].replace('.git', '')
+        repo_dir = os.path.join(clone_dir, repo_name)
+        mode = "clone"
+        if os.path.exists(repo_dir):
+            msg_box = QtWidgets.QMessageBox(self)
+            msg_box.setWindowTitle('目录已存在')
+            overwrite_button = msg_box.addButton("覆盖", QtWidgets.QMessageBox.ButtonRole.DestructiveRole)
+            update_button = None
+            if load_manifest(repo_dir) is not None:
+                msg_box.setText(f'目录 "{repo_name}" 已存在，是之前克隆的仓库。\n是否只下载有变化的文件？')
+                update_button = msg_box.addButton("增量更新", QtWidgets.QMessageBox.ButtonRole.AcceptRole)
+                msg_box.setDefaultButton(update_button)
+            else:
+                msg_box.setText(f'目录 "{repo_name}" 已存在。是否覆盖？')
+            cancel_button = msg_box.addButton("取消", QtWidgets.QMessageBox.ButtonRole.RejectRole)
+            if update_button is None:
+                msg_box.setDefaultButton(cancel_button)
+            msg_box.exec()
+            clicked = msg_box.clickedButton()
+            if clicked == update_button:
+                mode = "update"
+            elif clicked == overwrite_button:
+                mode = "overwrite"
+            else:
+                return
+
+        # 执行克隆操作
+        self.create_progress_dialog("克隆仓库", "正在下载仓库...")
+        self.tasks.submit(lambda: self.clone_repo_async(clone_url, clone_dir, mode, private), kind='clone')
+
+    async def clone_repo_async(self, clone_url, clone_dir, mode="clone", private=True):
         try:
             # 从 clone_url 中提取用户名和仓库名
             parts = clone_url.split('/')
             username = parts[-2]
             repo_name = parts[-1].replace('.git', '')
+            repo_dir = os.path.join(clone_dir, repo_name)
 
-            # 构建 API URL
-            api_url = f'https://api.github.com/repos/{username}/{repo_name}/zipball'
-
-            # 发送请求下载 zip 文件
-            response = requests.get(api_url, headers={'Authorization': f'token {self.current_token}'})
-            
-            if response.status_code == 200:
-                # 使用仓库作为目标录
-                repo_dir = os.path.join(clone_dir, repo_name)
-                
-                # 如果目录已存在，询问用户是否覆盖
-                if os.path.exists(repo_dir):
-                    reply = QtWidgets.QMessageBox.question(self, '目录已存在',
-                                                           f'目录 "{repo_name}" 已存在。是否覆盖？',
-                                                           QtWidgets.QMessageBox.StandardButton.Yes | 
-                                                           QtWidgets.QMessageBox.StandardButton.No,
-                                                           QtWidgets.QMessageBox.StandardButton.No)
-                    if reply == QtWidgets.QMessageBox.StandardButton.No:
-                        return
-                    shutil.rmtree(repo_dir)  # 删除现有目录
-                
-                os.makedirs(repo_dir, exist_ok=True)
-
-                # 解压 zip 文件
-                with zipfile.ZipFile(io.BytesIO(response.content)) as zip_ref:
-                    zip_ref.extractall(repo_dir)
-
-                # 移动文件到正确的位置
-                extracted_dir = os.path.join(repo_dir, os.listdir(repo_dir)[0])
-                for item in os.listdir(extracted_dir):
-                    shutil.move(os.path.join(extracted_dir, item), repo_dir)
-                os.rmdir(extracted_dir)
-
-                QtCore.QMetaObject.invokeMethod(self, "show_info_message",
-                                                QtCore.Qt.ConnectionType.QueuedConnection,
-                                                QtCore.Q_ARG(str, "下载成功"),
-                                                QtCore.Q_ARG(str, f"仓库内容已成功下载到 {repo_dir}"))
+            session = await self.main_window.http_client.get_session()
+            result, message, _ = await self.sync_repo(session, username, repo_name, repo_dir, mode, private)
+            if result == 'empty':
+                self.tasks.post(self.show_warning_message, "下载失败", message)
             else:
-                QtCore.QMetaObject.invokeMethod(self, "show_warning_message",
-                                                QtCore.Qt.ConnectionType.QueuedConnection,
-                                                QtCore.Q_ARG(str, "下载失败"),
-                                                QtCore.Q_ARG(str, f"下载失败: {response.status_code} - {response.text}"))
+                self.tasks.post(self.show_info_message, "下载成功" if result == 'cloned' else "更新成功", message)
+        except Exception as e:
+            self.tasks.post(self.show_warning_message, "错误", f"下载过程中发生错误: {str(e)}")
+        finally:
+            self.tasks.post(self.close_progress_dialog)
+
+    def mirror_all_repos(self):
+        if not self.current_token:
+            QtWidgets.QMessageBox.warning(self, "错误", "请先登录")
+            return
+        mirror_dir = QtWidgets.QFileDialog.getExistingDirectory(self, "选择镜像目录")
+        if not mirror_dir:
+            return
+        limit, ok = QtWidgets.QInputDialog.getInt(self, "磁盘写入限速", "最大写入速度（MB/s，0 表示不限制）:",
+                                                  self.mirror_max_mb_per_second, 0, 100000)
+        if not ok:
+            return
+        self.mirror_max_mb_per_second = limit
+
+        self.create_progress_dialog("镜像仓库", "正在获取仓库列表...")
+        self.main_window.log_message(f"开始镜像所有仓库到 {mirror_dir}")
+        self.tasks.submit(lambda: self.mirror_account_async(mirror_dir, limit * 1024 * 1024), kind='mirror')
+
+    async def mirror_account_async(self, mirror_dir, bytes_per_second=0):
+        # 仓库按 owner/repo 存放；pushed_at 与上次镜像相同的仓库不发任何请求，
+        # 有变化的仓库并发同步，能增量更新的只下载变化的文件
+        started = time.monotonic()
+        index = None
+        try:
+            repos = await self.fetch_repo_list(self.current_token)
+            await self.set_all_repos(repos)
+
+            index = MirrorIndex(mirror_dir)
+            limiter = ThroughputLimiter(bytes_per_second) if bytes_per_second else None
+            session = await self.main_window.http_client.get_session()
+            semaphore = asyncio.Semaphore(self.mirror_workers)
+            results = []
+            pending = []
+            for repo in repos:
+                repo_dir = os.path.join(mirror_dir, *repo['full_name'].split('/'))
+                if index.is_current(repo, repo_dir):
+                    results.append(MirrorResult(repo['full_name'], 'unchanged'))
+                else:
+                    pending.append((repo, repo_dir))
+
+            self.report_progress(0, len(pending))
+            self.report_progress_text(f"{len(pending)} 个仓库有变化，正在同步...")
+            done = [0]
+
+            async def mirror_repo(repo, repo_dir):
+                async with semaphore:
+                    repo_started = time.monotonic()
+                    mode = "update" if load_manifest(repo_dir) is not None else "clone"
+                    try:
+                        status, message, remote = await self.sync_repo(
+                            session, repo['owner']['login'], repo['name'], repo_dir, mode,
+                            repo.get('private', True), quiet=True, limiter=limiter)
+                        index.record(repo, remote['head_sha'] if remote else None, status)
+                        if status != 'updated':
+                            message = ''
+                    except Exception as e:
+                        status, message = 'failed', str(e)
+                    if index.should_save():
+                        await self.save_mirror_index(index)
+                    results.append(MirrorResult(repo['full_name'], status, message,
+                                                time.monotonic() - repo_started))
+                done[0] += 1
+                self.report_progress(done[0], len(pending))
+                self.report_progress_text(f"已同步 {done[0]} / {len(pending)} 个仓库")
+
+            await asyncio.gather(*(mirror_repo(repo, repo_dir) for repo, repo_dir in pending))
+
+            summary, report = format_mirror_report(results, time.monotonic() - started, mirror_dir)
+            report_path = write_mirror_report(mirror_dir, report)
+            print(f"镜像完成：{summary}")
+            self.tasks.post(self.show_info_message, "镜像完成", f"{summary}\n报告已保存到 {report_path}")
         except Exception as e:
-            QtCore.QMetaObject.invokeMethod(self, "show_warning_message",
-                                            QtCore.Qt.ConnectionType.QueuedConnection,
-                                            QtCore.Q_ARG(str, "错误"),
-                                            QtCore.Q_ARG(str, f"下载过程中发生错误: {str(e)}"))
+            self.tasks.post(self.show_warning_message, "镜像失败", f"镜像过程中发生错误: {str(e)}")
+        finally:
+            # 出错或取消时也保存已经同步完的仓库，下次不必重新下载
+            if index is not None:
+                await self.save_mirror_index(index)
+            self.tasks.post(self.close_progress_dialog)
+
+    @staticmethod
+    async def save_mirror_index(index):
+        # 索引每记录一批仓库保存一次，写入失败只影响下次是否需要重新检查，不中断镜像
+        try:
+            await index.save_async()
+        except OSError as e:
+            print(f"保存镜像索引失败: {str(e)}")
+
+    async def sync_repo(self, session, owner, repo_name, repo_dir, mode="clone", private=True,
+                        quiet=False, limiter=None):
+        # 把仓库默认分支的最新内容同步到 repo_dir，返回 (结果, 说明, 远程状态)
+        # 结果为 'cloned'、'updated'、'unchanged' 或 'empty'；出错时抛出异常
+        # quiet=True 时不更新进度对话框；limiter 限制写入磁盘的速度
+        headers = {'Authorization': f'token {self.current_token}'}
+
+        # 先取得默认分支的头提交和完整文件列表，写入清单供之后增量更新
+        # 公开仓库的下载是只读的，可以分散到 token 池；私有仓库固定使用登录的 token
+        api = GitDataApi(session, headers, owner, repo_name, priority=PRIORITY_BULK, pooled=not private)
+        remote = await self.fetch_remote_state(api, with_files=True)
+        if remote is None:
+            return 'empty', f"仓库 {repo_name} 为空", None
+
+        manifest = load_manifest(repo_dir) if mode == "update" else None
+        if manifest and manifest.get('complete') and remote['complete']:
+            updated, removed = await self.update_clone_async(api, remote, repo_dir, manifest, quiet, limiter)
+            save_manifest(repo_dir, owner, repo_name, remote)
+            if updated or removed:
+                return 'updated', f"仓库已更新：下载 {updated} 个文件，删除 {removed} 个文件", remote
+            return 'unchanged', "仓库已是最新", remote
+
+        # 下载与清单中记录的同一个提交
+        api_url = f'https://api.github.com/repos/{owner}/{repo_name}/zipball/{remote["head_sha"]}'
+
+        # 分块下载 zip 到临时文件，内存占用与仓库大小无关
+        parent_dir = os.path.dirname(repo_dir)
+        os.makedirs(parent_dir, exist_ok=True)
+        fd, zip_path = tempfile.mkstemp(prefix=f'{repo_name}-', suffix='.zip', dir=parent_dir)
+        os.close(fd)
+        try:
+            status, error_text = await self.download_to_file(session, api_url, headers, zip_path,
+                                                             pooled=not private, quiet=quiet, limiter=limiter)
+            if status != 200:
+                raise GitDataError(status, f"下载失败: {error_text}")
+
+            if os.path.exists(repo_dir):
+                shutil.rmtree(repo_dir)  # 删除现有目录
+            os.makedirs(repo_dir, exist_ok=True)
+
+            # 解压时直接去掉 GitHub 的 owner-repo-sha/ 外层目录，在线程池中并行解压
+            if not quiet:
+                self.report_progress_text("正在解压...")
+            on_progress = None if quiet else self.report_progress
+            throttle = limiter.consume_blocking if limiter else None
+            await asyncio.get_running_loop().run_in_executor(
+                None, lambda: extract_zipball(zip_path, repo_dir, workers=self.extract_workers,
+                                              on_progress=on_progress, throttle=throttle))
+            save_manifest(repo_dir, owner, repo_name, remote)
+        finally:
+            if os.path.exists(zip_path):
+                os.remove(zip_path)
+        return 'cloned', f"仓库内容已成功下载到 {repo_dir}", remote
+
+    async def update_clone_async(self, api, remote, repo_dir, manifest, quiet=False, limiter=None):
+        # 比较清单与远程目录树，只下载新增或变化的 blob，删除远程已删除的文件
+        if manifest.get('commit_sha') == remote['head_sha']:
+            return 0, 0
+        changed, removed = diff_files(manifest.get('files', {}), remote['files'])
+        changed_entries = {path: (sha, mode) for path, sha, mode in changed}
+
+        async def download(file_path, path):
+            sha, mode = changed_entries[path]
+            try:
+                content = await api.get_blob(sha)
+            except GitDataError as e:
+                return e.status, e.headers
+            if limiter:
+                await limiter.consume(len(content))
+            self.write_blob(repo_dir, path, content, mode)
+            return 200, None
+
+        # 先删除再写入：路径类型变化（文件/目录/符号链接互换）时旧路径会挡住新文件
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: clear_update_targets(repo_dir, list(changed_entries), removed))
+        if quiet:
+            pipeline = UploadPipeline(worker_count=self.upload_workers)
+        else:
+            self.report_progress_text(f"正在下载 {len(changed)} 个变化的文件...")
+            pipeline = self.create_pipeline()
+        failed = await pipeline.run(((None, path) for path in changed_entries), download)
+        if failed:
+            raise GitDataError(None, f"{len(failed)} 个文件下载失败，例如 {failed[0][0]}: {failed[0][1]}")
+        return len(changed), len(removed)
+
+    @staticmethod
+    def write_blob(repo_dir, path, content, mode):
+        target = safe_target(repo_dir, path)
+        # safe_target 只检查路径字符串，这里再按真实路径检查上级目录，不经由符号链接写到仓库之外
+        if not is_inside(repo_dir, os.path.dirname(target)):
+            raise ValueError(f"路径经由符号链接指向仓库目录之外: {path}")
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if os.path.islink(target):
+            os.remove(target)
+        if mode == '120000':
+            try:
+                if os.path.lexists(target):
+                    os.remove(target)
+                os.symlink(content.decode('utf-8'), target)
+                return
+            except (OSError, NotImplementedError):
+                pass  # 不支持符号链接时写成普通文件
+        with open(target, 'wb') as file:
+            file.write(content)
+        if os.name != 'nt':
+            os.chmod(target, 0o755 if mode == '100755' else 0o644)
+
+    async def download_to_file(self, session, url, headers, target_path, chunk_size=1 << 16, pooled=False,
+                               quiet=False, limiter=None):
+        # 返回 (状态码, 错误信息)，下载过程中按字节报告进度（quiet=True 时不报告）
+        async with session.get(url, headers=headers, priority=PRIORITY_BULK, pooled=pooled) as response:
+            if response.status != 200:
+                return response.status, await response.text()
+
+            total = response.content_length or 0
+            done = 0
+            last_report = 0.0
+            with open(target_path, 'wb') as file:
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    if limiter:
+                        await limiter.consume(len(chunk))
+                    file.write(chunk)
+                    done += len(chunk)
+                    if quiet:
+                        continue
+                    now = time.monotonic()
+                    if now - last_report >= 0.1:
+                        last_report = now
+                        self.report_download_progress(done, total)
+            if not quiet:
+                self.report_download_progress(done, total)
+            return response.status, None
+
+    def report_download_progress(self, done, total):
+        # 进度条以 KB 为单位，避免超过 int 范围；总大小未知时显示忙碌状态
+        self.report_progress(done // 1024, total // 1024)
+        if total:
+            self.report_progress_text(f"已下载 {format_bytes(done)} / {format_bytes(total)}")
+        else:
+            self.report_progress_text(f"已下载 {format_bytes(done)}")
 
     def create_progress_dialog(self, title, message):
         self.progress_dialog = QtWidgets.QProgressDialog(message, None, 0, 0, self)
@@ -632,6 +1124,14 @@ class RepositoryTab(QtWidgets.QWidget):
             self.progress_dialog.setMaximum(maximum)
             self.progress_dialog.setValue(value)
 
+    @QtCore.pyqtSlot(str)
+    def update_progress_text(self, text):
+        if self.progress_dialog:
+            self.progress_dialog.setLabelText(text)
+
+    def report_progress_text(self, text):
+        self.tasks.post(self.update_progress_text, text, key='progress_text')
+
     @QtCore.pyqtSlot()
     def close_progress_dialog(self):
         if self.progress_dialog:
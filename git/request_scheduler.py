@@ -0,0 +1,254 @@
+import asyncio
+import hashlib
+import heapq
+import itertools
+import time
+
+# 数值越小越先执行
+PRIORITY_INTERACTIVE = 0  # 登录、搜索等用户正在等待的操作
+PRIORITY_NORMAL = 1       # 刷新列表、新建/删除仓库
+PRIORITY_BULK = 2         # 批量上传、下载
+
+
+def resource_for_url(url):
+    # 对应 GitHub 的 X-RateLimit-Resource
+    url = str(url)
+    if '/search/' in url:
+        return 'search'
+    if url.rstrip('/').endswith('/graphql'):
+        return 'graphql'
+    return 'core'
+
+
+def bucket_for(resource, headers):
+    # 配额按 token 分别计算，所以排队和记录都以 "资源:token 指纹" 为单位
+    auth = (headers or {}).get('Authorization', '')
+    fingerprint = hashlib.sha1(auth.encode('utf-8')).hexdigest()[:8] if auth else 'anonymous'
+    return f"{resource}:{fingerprint}"
+
+
+class RateLimitScheduler:
+    # 所有 GitHub 请求都先在这里排队：按优先级放行，配额用完时暂停到重置时间
+
+    def __init__(self, max_concurrent=10):
+        self.max_concurrent = max_concurrent
+        self.active = 0
+        self.waiters = []  # 堆：(优先级, 序号, 配额桶, future)
+        self.counter = itertools.count()
+        self.limits = {}  # 配额桶 -> {'limit', 'remaining', 'reset'}
+        self.paused_until = {}  # 配额桶 -> 时间戳（来自 Retry-After）
+        self.timer = None
+
+    async def acquire(self, bucket, priority=PRIORITY_NORMAL):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, (priority, next(self.counter), bucket, future))
+        self.dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # 已经拿到名额但被取消，归还名额
+            raise
+
+    def release(self):
+        self.active -= 1
+        self.dispatch()
+
+    def dispatch(self):
+        now = time.time()
+        blocked = []
+        while self.waiters and self.active < self.max_concurrent:
+            item = heapq.heappop(self.waiters)
+            bucket, future = item[2], item[3]
+            if future.done():
+                continue
+            if self.wait_time(bucket, now) > 0:
+                blocked.append(item)  # 该配额桶暂停中，不影响其他资源或其他 token 的请求
+                continue
+            self.active += 1
+            info = self.limits.get(bucket)
+            if info is not None:
+                info['remaining'] -= 1  # 预先扣减，避免并发请求超出剩余配额
+            future.set_result(None)
+        for item in blocked:
+            heapq.heappush(self.waiters, item)
+
+        if blocked:
+            delay = min(self.wait_time(item[2], now) for item in blocked)
+            self.schedule_dispatch(delay)
+
+    def schedule_dispatch(self, delay):
+        if self.timer is not None:
+            self.timer.cancel()
+        self.timer = asyncio.get_running_loop().call_later(max(delay, 0.05), self.dispatch)
+
+    def wait_time(self, bucket, now=None):
+        now = now or time.time()
+        until = self.paused_until.get(bucket, 0)
+        info = self.limits.get(bucket)
+        if info is not None and info['remaining'] <= 0:
+            if now >= info['reset']:
+                info['remaining'] = info['limit']  # 已过重置时间，配额恢复
+            else:
+                until = max(until, info['reset'])
+        return until - now
+
+    def remaining(self, bucket):
+        # 估计的剩余配额；还没有收到过响应时返回 None
+        info = self.limits.get(bucket)
+        if info is None:
+            return None
+        if time.time() >= info['reset']:
+            return info['limit']
+        return info['remaining']
+
+    def update(self, bucket, status, headers):
+        # 记录响应中的配额信息；被限流时返回 True，调用方应当重试
+        resource, fingerprint = bucket.split(':', 1)
+        resource = headers.get('X-RateLimit-Resource', resource)
+        bucket = f"{resource}:{fingerprint}"
+        remaining = headers.get('X-RateLimit-Remaining')
+        if remaining is not None:
+            try:
+                self.limits[bucket] = {
+                    'limit': int(headers.get('X-RateLimit-Limit', remaining)),
+                    'remaining': int(remaining),
+                    'reset': float(headers.get('X-RateLimit-Reset', 0)),
+                }
+            except ValueError:
+                pass
+
+        if status not in (403, 429):
+            return False
+        retry_after = headers.get('Retry-After')
+        if retry_after is not None:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                delay = 60
+            self.paused_until[bucket] = time.time() + delay
+            print(f"触发 GitHub 次级限流，{resource} 请求暂停 {delay:.0f} 秒")
+            return True
+        if remaining == '0':
+            print(f"GitHub {resource} 配额已用完，暂停到重置时间")
+            return True
+        if status == 429:
+            # 没有 Retry-After 时按 GitHub 文档的建议至少等待一分钟
+            self.paused_until[bucket] = time.time() + 60
+            return True
+        return False
+
+    def status(self):
+        return {bucket: dict(info) for bucket, info in self.limits.items()}
+
+
+class ScheduledSession:
+    # 包装 aiohttp.ClientSession，接口保持不变，额外支持 priority 参数
+
+    def __init__(self, session, scheduler, token_pool=None, max_retries=3, tracer=None):
+        self.session = session
+        self.scheduler = scheduler
+        self.token_pool = token_pool
+        self.max_retries = max_retries
+        self.tracer = tracer  # RequestTracer，记录每个请求的排队时间、延迟和限流信息
+
+    @property
+    def closed(self):
+        return self.session.closed
+
+    async def close(self):
+        await self.session.close()
+
+    def request(self, method, url, priority=PRIORITY_NORMAL, pooled=False, scopes=(), **kwargs):
+        # pooled=True 表示只读请求，可以改用 token 池中剩余配额最多的 token；
+        # 写操作不要设置，保持使用调用方给出的登录 token
+        return ScheduledRequest(self, method, url, priority, pooled, scopes, kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request('PATCH', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+
+class ScheduledRequest:
+    def __init__(self, owner, method, url, priority, pooled, scopes, kwargs):
+        self.owner = owner
+        self.method = method
+        self.url = url
+        self.priority = priority
+        self.pooled = pooled
+        self.scopes = scopes
+        self.kwargs = kwargs
+        self.resource = resource_for_url(url)
+        self.response = None
+        self.span = None
+
+    def choose_headers(self):
+        headers = dict(self.kwargs.get('headers') or {})
+        pool = self.owner.token_pool
+        if (self.pooled or self.scopes) and pool is not None:
+            current = headers.get('Authorization', '')[len('token '):]
+            token = pool.pick(self.resource, self.scopes, current)
+            if token:
+                headers['Authorization'] = f'token {token}'
+        return headers
+
+    async def __aenter__(self):
+        scheduler = self.owner.scheduler
+        tracer = self.owner.tracer
+        kwargs = dict(self.kwargs)
+        for attempt in range(self.owner.max_retries + 1):
+            headers = self.choose_headers()
+            kwargs['headers'] = headers
+            bucket = bucket_for(self.resource, headers)
+            span = tracer.start(self.method, self.url, self.priority, attempt) if tracer else None
+            await scheduler.acquire(bucket, self.priority)
+            if span:
+                span.sent()
+            try:
+                response = await self.owner.session.request(self.method, self.url, **kwargs)
+            except BaseException as e:
+                scheduler.release()
+                if span:
+                    span.finish(error=e)
+                    tracer.record(span)
+                raise
+            if span:
+                span.got_response(response)
+            limited = scheduler.update(bucket, response.status, response.headers)
+            retry = limited
+            if self.owner.token_pool is not None:
+                token = headers.get('Authorization', '')[len('token '):]
+                self.owner.token_pool.update(token, response.status, response.headers)
+                # 池中的 token 失效时换一个重试
+                retry = retry or (self.pooled and response.status == 401)
+            if retry and attempt < self.owner.max_retries:
+                # 放弃这次响应，重新排队；限流时等配额恢复后自动重发
+                response.release()
+                scheduler.release()
+                if span:
+                    span.retried = True
+                    span.finish(response)
+                    tracer.record(span)
+                continue
+            self.response = response
+            self.span = span
+            return response
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.response.release()
+        self.owner.scheduler.release()
+        if self.span:
+            # 在释放响应时结束 span，读取响应体的时间也计入
+            self.span.finish(self.response, exc)
+            self.owner.tracer.record(self.span)
@@ -0,0 +1,197 @@
+import json
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+# 路径中这些段保持原样，其余的（用户名、仓库名、sha、文件路径等）替换为占位符
+KNOWN_SEGMENTS = {
+    'repos', 'user', 'users', 'orgs', 'search', 'repositories', 'contents', 'git', 'blobs', 'trees',
+    'commits', 'ref', 'refs', 'heads', 'tags', 'zipball', 'tarball', 'topics', 'branches', 'rate_limit',
+}
+
+# 这些段之后的内容一律归为对应的占位符
+PLACEHOLDER_AFTER = {
+    'contents': '{path}', 'heads': '{branch}', 'tags': '{tag}', 'blobs': '{sha}', 'trees': '{sha}',
+    'commits': '{sha}', 'zipball': '{ref}', 'tarball': '{ref}',
+}
+
+# 延迟直方图的桶上界（秒），最后一个桶收集所有更慢的请求
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+# 需要随 span 一起记录的限流响应头
+RATE_LIMIT_HEADERS = ('X-RateLimit-Limit', 'X-RateLimit-Remaining', 'X-RateLimit-Reset',
+                      'X-RateLimit-Resource', 'Retry-After')
+
+
+def endpoint_for(method, url):
+    # 把具体 URL 归并为接口模板，例如 PUT /repos/{owner}/{repo}/contents/{path}
+    segments = [segment for segment in urlsplit(str(url)).path.split('/') if segment]
+    template = []
+    if len(segments) >= 3 and segments[0] == 'repos':
+        template = ['repos', '{owner}', '{repo}']
+        segments = segments[3:]
+    elif len(segments) >= 2 and segments[0] in ('users', 'orgs'):
+        template = [segments[0], '{name}']
+        segments = segments[2:]
+    for segment in segments:
+        placeholder = PLACEHOLDER_AFTER.get(template[-1]) if template else None
+        if placeholder or segment not in KNOWN_SEGMENTS:
+            template.append(placeholder or '{id}')
+            break
+        template.append(segment)
+    return f"{method} /" + '/'.join(template)
+
+
+class Span:
+    # 一次 HTTP 请求（包括被重试的那几次）的耗时记录
+    def __init__(self, method, url, priority, attempt):
+        self.method = method
+        self.url = str(url)
+        self.endpoint = endpoint_for(method, url)
+        self.priority = priority
+        self.attempt = attempt
+        self.start = time.time()
+        self.queued_at = time.monotonic()
+        self.sent_at = None
+        self.headers_at = None
+        self.finished_at = None
+        self.status = None
+        self.bytes = 0
+        self.rate_limit = {}
+        self.retried = False
+        self.error = None
+
+    def sent(self):
+        self.sent_at = time.monotonic()
+
+    def got_response(self, response):
+        self.headers_at = time.monotonic()
+        self.status = response.status
+        self.rate_limit = {name: response.headers[name] for name in RATE_LIMIT_HEADERS if name in response.headers}
+
+    def finish(self, response=None, error=None):
+        self.finished_at = time.monotonic()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        if response is not None:
+            # 流式读取时以实际读取的字节数为准，否则用 Content-Length
+            total = getattr(response.content, 'total_bytes', None)
+            self.bytes = total or response.content_length or 0
+
+    @property
+    def queue_wait(self):
+        return (self.sent_at or self.finished_at) - self.queued_at
+
+    @property
+    def latency(self):
+        # 发出请求到收到响应头
+        if self.sent_at is None or self.headers_at is None:
+            return None
+        return self.headers_at - self.sent_at
+
+    @property
+    def duration(self):
+        # 发出请求到响应被释放（包括读取响应体）
+        if self.sent_at is None:
+            return 0.0
+        return self.finished_at - self.sent_at
+
+    def to_dict(self):
+        return {
+            'ts': round(self.start, 3),
+            'method': self.method,
+            'endpoint': self.endpoint,
+            'url': self.url,
+            'priority': self.priority,
+            'attempt': self.attempt,
+            'status': self.status,
+            'bytes': self.bytes,
+            'queue_wait_ms': round(self.queue_wait * 1000, 1),
+            'latency_ms': None if self.latency is None else round(self.latency * 1000, 1),
+            'duration_ms': round(self.duration * 1000, 1),
+            'retried': self.retried,
+            'rate_limit': self.rate_limit,
+            'error': self.error,
+        }
+
+
+class EndpointStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.bytes = 0
+        self.total_latency = 0.0
+        self.total_queue_wait = 0.0
+        self.max_latency = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    def add(self, span):
+        latency = span.latency if span.latency is not None else span.duration
+        self.count += 1
+        if span.error or span.status is None or span.status >= 400:
+            self.errors += 1
+        self.bytes += span.bytes
+        self.total_latency += latency
+        self.total_queue_wait += span.queue_wait
+        self.max_latency = max(self.max_latency, latency)
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                self.buckets[index] += 1
+                break
+
+    def snapshot(self):
+        stats = EndpointStats()
+        stats.__dict__.update(self.__dict__)
+        stats.buckets = list(self.buckets)
+        return stats
+
+    def percentile(self, fraction):
+        # 用直方图估计分位数：返回累计数达到该比例的桶的上界
+        target = fraction * self.count
+        cumulative = 0
+        for index, count in enumerate(self.buckets):
+            cumulative += count
+            if count and cumulative >= target:
+                return min(LATENCY_BUCKETS[index], self.max_latency)
+        return self.max_latency
+
+
+class RequestTracer:
+    # 收集所有请求的 span：保留最近 max_spans 个用于导出，并按接口汇总直方图
+    # span 在事件循环线程中记录，界面线程读取统计，所以用锁保护
+
+    def __init__(self, max_spans=20000):
+        self.spans = deque(maxlen=max_spans)
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def start(self, method, url, priority, attempt=0):
+        return Span(method, url, priority, attempt)
+
+    def record(self, span):
+        with self.lock:
+            self.spans.append(span)
+            stats = self.stats.get(span.endpoint)
+            if stats is None:
+                stats = self.stats[span.endpoint] = EndpointStats()
+            stats.add(span)
+
+    def summary(self):
+        # 按请求次数从多到少返回 [(接口, EndpointStats)]
+        with self.lock:
+            return sorted(((endpoint, stats.snapshot()) for endpoint, stats in self.stats.items()),
+                          key=lambda item: -item[1].count)
+
+    def reset(self):
+        with self.lock:
+            self.spans.clear()
+            self.stats = {}
+
+    def export_jsonl(self, path):
+        with self.lock:
+            spans = list(self.spans)
+        with open(path, 'w', encoding='utf-8') as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), ensure_ascii=False) + '\n')
+        return len(spans)
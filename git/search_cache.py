@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+
+
+def normalize_query(query):
+    # 大小写和多余空白不影响 GitHub 的搜索结果
+    return ' '.join(query.lower().split())
+
+
+class SearchCache:
+    # GitHub 搜索结果缓存：内存中按 LRU 淘汰，同时保存到 data/ 下，重启后仍然可用
+    # ttl 内的结果直接使用；超过 ttl 但未超过 max_stale 的结果先显示，再在后台重新验证
+    # 条目在事件循环线程中读写，保存在后台线程中进行，所以用锁保护
+
+    def __init__(self, path=None, max_entries=100, ttl=600, max_stale=86400, save_delay=30):
+        if path is None:
+            path = os.path.join(os.getcwd(), 'data', 'cache', 'search.json')
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.entries = OrderedDict()  # 缓存键 -> {'time', 'total', 'items'}
+        self.dirty = False
+        self.save_delay = save_delay  # 修改后最多等这么多秒再写入文件，期间的多次修改只写一次
+        self.save_timer = None
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.load()
+
+    @staticmethod
+    def cache_key(query, sort, order, page, per_page):
+        return f"{normalize_query(query)}|{sort}|{order}|{page}|{per_page}"
+
+    def get(self, query, sort='stars', order='desc', page=1, per_page=30):
+        # 返回 (条目, 是否仍然新鲜)；没有可用缓存时返回 (None, False)
+        key = self.cache_key(query, sort, order, page, per_page)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None, False
+            age = time.time() - entry['time']
+            if age > self.max_stale:
+                del self.entries[key]
+                self.dirty = True
+                return None, False
+            self.entries.move_to_end(key)
+            return entry, age <= self.ttl
+
+    def put(self, query, items, total=None, sort='stars', order='desc', page=1, per_page=30):
+        # 返回内容是否与缓存中的旧结果不同
+        key = self.cache_key(query, sort, order, page, per_page)
+        with self.lock:
+            old = self.entries.get(key)
+            changed = old is None or [repo['id'] for repo in old['items']] != [repo['id'] for repo in items]
+            self.entries[key] = {'time': time.time(), 'total': total, 'items': items}
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.dirty = True
+        return changed
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.dirty = True
+        self.save()
+
+    def schedule_save(self):
+        # 在后台线程中延迟保存，序列化整个缓存不占用事件循环
+        with self.lock:
+            if not self.dirty or self.save_timer is not None:
+                return
+            self.save_timer = threading.Timer(self.save_delay, self.save)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        # 文件中按最近使用的先后顺序保存
+        for key, entry in entries:
+            self.entries[key] = entry
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def save(self):
+        # 延迟保存的定时器和退出时都会调用；条目的 items 只会整体替换，复制列表即可得到一致的快照
+        with self.lock:
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+                self.save_timer = None
+            if not self.dirty:
+                return
+            entries = list(self.entries.items())
+            self.dirty = False
+        with self.write_lock:
+            tmp_path = self.path + '.tmp'
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"写入搜索缓存失败: {str(e)}")
+                with self.lock:
+                    self.dirty = True
+
+
+# 应用内共享的缓存实例
+search_cache = SearchCache()
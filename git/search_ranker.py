@@ -0,0 +1,108 @@
+import calendar
+import heapq
+import itertools
+
+# 排序方式：显示名称 -> 内部名称
+RANKINGS = {
+    "星标最多": 'stars',
+    "最近活跃": 'recent',
+    "精确匹配优先": 'exact',
+}
+
+
+def parse_timestamp(value):
+    # GitHub 时间固定为 2024-01-02T03:04:05Z 格式，直接按位置切分，比 strptime 快得多
+    if not value:
+        return 0
+    try:
+        return calendar.timegm((int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                                int(value[11:13]), int(value[14:16]), int(value[17:19]), 0, 0, 0))
+    except (ValueError, IndexError):
+        return 0
+
+
+class SearchRanker:
+    # 只保留排名最靠前的 limit 个结果：堆顶是当前最差的结果，新结果只需和它比较
+    # 每个仓库的排序键只计算一次，按 id 缓存；键按升序排列即为显示顺序
+
+    def __init__(self, ranking='stars', search_text='', limit=1000):
+        self.ranking = ranking
+        self.search_text = search_text.lower()
+        self.limit = limit
+        self.keys = {}  # 仓库 id -> 排序键
+        self.heap = []  # (取反的排序键, 序号, 仓库)
+        self.counter = itertools.count()
+
+    def reset(self, ranking=None, search_text=None):
+        if ranking is not None:
+            self.ranking = ranking
+        if search_text is not None:
+            self.search_text = search_text.lower()
+        self.keys = {}
+        self.heap = []
+
+    def key(self, repo):
+        key = self.keys.get(repo['id'])
+        if key is None:
+            key = self.compute_key(repo)
+            self.keys[repo['id']] = key
+        return key
+
+    def compute_key(self, repo):
+        stars = repo.get('stargazers_count', 0)
+        watchers = repo.get('watchers_count', 0)
+        updated = parse_timestamp(repo.get('pushed_at') or repo.get('updated_at'))
+        if self.ranking == 'recent':
+            return (-updated, -stars, repo['id'])
+        if self.ranking == 'exact':
+            return (self.match_rank(repo), -stars, -updated, repo['id'])
+        return (-stars, -watchers, -updated, repo['id'])
+
+    def match_rank(self, repo):
+        # 0：名称完全相同；1：名称包含搜索词；2：其他
+        if not self.search_text:
+            return 2
+        name = (repo.get('name') or '').lower()
+        full_name = (repo.get('full_name') or '').lower()
+        if self.search_text in (name, full_name):
+            return 0
+        if self.search_text in full_name:
+            return 1
+        return 2
+
+    def add(self, repo):
+        # 返回 (是否进入前 limit 名, 被挤出去的仓库)
+        key = self.key(repo)
+        entry = (tuple(-part for part in key), next(self.counter), repo)
+        if len(self.heap) < self.limit:
+            heapq.heappush(self.heap, entry)
+            return True, None
+        if entry[0] <= self.heap[0][0]:
+            return False, None  # 比当前最差的结果还差
+        evicted = heapq.heapreplace(self.heap, entry)[2]
+        return True, evicted
+
+    def extend(self, repos):
+        # 批量加入，返回 (进入前 limit 名的仓库, 被挤出去的仓库)
+        accepted = []
+        evicted = []
+        for repo in repos:
+            added, dropped = self.add(repo)
+            if added:
+                accepted.append(repo)
+            if dropped is not None:
+                evicted.append(dropped)
+        # 同一批中先进入又被挤出的仓库从未显示过，两边都去掉
+        accepted_ids = {repo['id'] for repo in accepted}
+        evicted_ids = {repo['id'] for repo in evicted}
+        return ([repo for repo in accepted if repo['id'] not in evicted_ids],
+                [repo for repo in evicted if repo['id'] not in accepted_ids])
+
+    def ranked(self):
+        return [entry[2] for entry in sorted(self.heap, key=lambda entry: self.key(entry[2]))]
+
+
+def rank_results(results, ranking='stars', search_text='', limit=None):
+    ranker = SearchRanker(ranking, search_text, limit or max(len(results), 1))
+    ranker.extend(results)
+    return ranker.ranked()
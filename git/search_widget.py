@@ -4,8 +4,15 @@ import re
 class SearchWidget(QtWidgets.QWidget):
     search_changed = QtCore.pyqtSignal(str, str)  # 只发送搜索文本和搜索选项
 
+    DEBOUNCE_MS = 200  # 输入停止多久后才真正触发搜索
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.generation = 0  # 每次输入变化加一，用于丢弃过期的搜索结果
+        self.debounce_timer = QtCore.QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(self.DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self.emit_search_changed)
         self.init_ui()
 
     def init_ui(self):
@@ -24,10 +31,17 @@ class SearchWidget(QtWidgets.QWidget):
         layout.addWidget(self.result_count_label)
 
     def on_search_changed(self):
+        self.generation += 1
+        self.debounce_timer.start()
+
+    def emit_search_changed(self):
         search_text = self.search_input.text()
         search_option = self.search_options.currentText()
         self.search_changed.emit(search_text, search_option)
 
+    def is_current(self, generation):
+        return generation == self.generation
+
     def set_result_count(self, count):
         self.result_count_label.setText(f"找到 {count} 个结果")
 
@@ -0,0 +1,58 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# 启动基准：多次冷启动 main.py（或打包后的可执行文件），汇总每个阶段耗时的中位数和最小值
+# 用法: python git/startup_bench.py -n 10 [--command dist/gitclient.exe]
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+
+
+def run_once(command, output_path, timeout):
+    env = dict(os.environ, GITCLIENT_STARTUP_BENCH=output_path)
+    started = time.perf_counter()
+    subprocess.run(command, env=env, timeout=timeout, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - started
+
+
+def summarize(records, process_times):
+    # 按阶段汇总；进程总耗时包括解释器启动和退出
+    phases = {}
+    for record in records:
+        for item in record['phases']:
+            phases.setdefault(item['phase'], []).append(item['ms'])
+    phases['进程总耗时'] = [seconds * 1000 for seconds in process_times]
+    width = max(len(phase) for phase in phases)
+    lines = [f"{'阶段'.ljust(width)}  {'中位数':>10}  {'最小值':>10}  次数"]
+    for phase, values in phases.items():
+        lines.append(f"{phase.ljust(width)}  {statistics.median(values):8.1f}ms  {min(values):8.1f}ms  {len(values)}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量 Git 客户端冷启动各阶段耗时")
+    parser.add_argument('-n', '--runs', type=int, default=5, help="启动次数")
+    parser.add_argument('--command', help="要测量的可执行文件，默认用当前解释器运行 main.py")
+    parser.add_argument('--timeout', type=float, default=60, help="单次启动的超时时间（秒）")
+    args = parser.parse_args()
+
+    command = [args.command] if args.command else [sys.executable, MAIN_SCRIPT]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = os.path.join(temp_dir, 'startup.jsonl')
+        process_times = []
+        for run in range(args.runs):
+            process_times.append(run_once(command, output_path, args.timeout))
+            print(f"第 {run + 1}/{args.runs} 次: {process_times[-1] * 1000:.0f} ms")
+        with open(output_path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f if line.strip()]
+    print(summarize(records, process_times))
+
+
+if __name__ == '__main__':
+    main()
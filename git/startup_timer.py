@@ -0,0 +1,37 @@
+import json
+import os
+import time
+
+
+class StartupTimer:
+    # 记录启动各阶段的耗时：mark 记下从上一个阶段结束到现在的时间，以及从进程开始计时到现在的时间
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.last = self.started
+        self.phases = []  # [(阶段名称, 本阶段耗时, 距开始的时间)]，单位秒
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last, now - self.started))
+        self.last = now
+
+    def report(self):
+        width = max((len(phase) for phase, _, _ in self.phases), default=0)
+        lines = ["启动耗时："]
+        for phase, duration, elapsed in self.phases:
+            lines.append(f"  {phase.ljust(width)}  {duration * 1000:8.1f} ms  (累计 {elapsed * 1000:8.1f} ms)")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        return {
+            'ts': round(time.time(), 3),
+            'phases': [{'phase': phase, 'ms': round(duration * 1000, 1), 'elapsed_ms': round(elapsed * 1000, 1)}
+                       for phase, duration, elapsed in self.phases],
+        }
+
+    def save(self, path):
+        # 每次启动追加一行 JSON，便于多次运行后比较
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.to_dict(), ensure_ascii=False) + '\n')
@@ -0,0 +1,142 @@
+import asyncio
+import itertools
+import threading
+import traceback
+from collections import OrderedDict
+from concurrent.futures import Future, InvalidStateError
+from PyQt6 import QtCore
+
+# 各类操作同时运行的任务数上限；未列出的类型不限制
+DEFAULT_LIMITS = {
+    'refresh': 1,
+    'upload': 2,
+    'clone': 2,
+    'mirror': 1,
+    'bulk': 2,
+    'search': 4,
+}
+
+
+class TaskRunner(QtCore.QObject):
+    # Qt 线程与 asyncio 线程之间的桥梁：
+    # submit 把协程交给后台事件循环运行并返回 Future，可以取消；
+    # post 把回调送回 Qt 线程，按固定间隔批量执行，同一个 key 只保留最新的一次（用于进度）
+    task_failed = QtCore.pyqtSignal(str, str)  # 任务类型, 错误信息
+
+    def __init__(self, parent=None, limits=None, flush_interval=50):
+        super().__init__(parent)
+        self.loop = None
+        self.limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self.semaphores = {}
+        self.tasks = {}  # Future -> 任务类型
+        self.waiting = []  # 事件循环开始运行前提交的任务
+        self.updates = OrderedDict()
+        self.updates_lock = threading.Lock()
+        self.counter = itertools.count()
+
+        self.flush_timer = QtCore.QTimer(self)
+        self.flush_timer.setInterval(flush_interval)
+        self.flush_timer.timeout.connect(self.flush_updates)
+        self.flush_timer.start()
+
+    def attach(self, loop):
+        # 由 main() 在后台线程中的事件循环创建后调用；之后提交的任务都在这个循环中运行
+        self.loop = loop
+        waiting, self.waiting = self.waiting, []
+        for future, factory, kind in waiting:
+            self.start(future, factory, kind)
+
+    def submit(self, factory, kind='default', on_done=None, on_error=None):
+        # factory 是返回协程的函数，在事件循环线程中调用，保证协程属于正在运行的循环；
+        # on_done(结果) / on_error(异常) 在 Qt 线程中执行；没有 on_error 时发出 task_failed
+        future = Future()
+        self.tasks[future] = kind
+        future.add_done_callback(lambda done: self.task_finished(done, kind, on_done, on_error))
+        if self.loop is None:
+            self.waiting.append((future, factory, kind))
+        else:
+            self.start(future, factory, kind)
+        return future
+
+    def start(self, future, factory, kind):
+        def create():
+            if future.cancelled():
+                return
+            task = self.loop.create_task(self.run(factory, kind))
+
+            def copy_result(task):
+                try:
+                    if task.cancelled():
+                        future.cancel()
+                    elif task.exception() is not None:
+                        future.set_exception(task.exception())
+                    else:
+                        future.set_result(task.result())
+                except InvalidStateError:
+                    pass  # Future 已经在 Qt 线程中被取消
+
+            task.add_done_callback(copy_result)
+            # 在 Qt 线程中取消 Future 时同时取消事件循环中的任务
+            future.add_done_callback(
+                lambda done: done.cancelled() and self.loop.call_soon_threadsafe(task.cancel))
+
+        self.loop.call_soon_threadsafe(create)
+
+    async def run(self, factory, kind):
+        semaphore = self.semaphore_for(kind)
+        if semaphore is None:
+            return await factory()
+        async with semaphore:
+            return await factory()
+
+    def semaphore_for(self, kind):
+        limit = self.limits.get(kind)
+        if not limit:
+            return None
+        semaphore = self.semaphores.get(kind)
+        if semaphore is None:
+            semaphore = self.semaphores[kind] = asyncio.Semaphore(limit)
+        return semaphore
+
+    def task_finished(self, future, kind, on_done, on_error):
+        self.tasks.pop(future, None)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            if on_done:
+                self.post(on_done, future.result())
+        elif on_error:
+            self.post(on_error, error)
+        else:
+            message = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+            print(f"后台任务 {kind} 出错:\n{message}")
+            self.post(self.task_failed.emit, kind, f"{type(error).__name__}: {error}")
+
+    def cancel_all(self, kind=None):
+        for future, task_kind in list(self.tasks.items()):
+            if kind is None or task_kind == kind:
+                future.cancel()
+
+    def running(self, kind=None):
+        return sum(1 for task_kind in self.tasks.values() if kind is None or task_kind == kind)
+
+    def post(self, callback, *args, key=None):
+        # 可以在任何线程中调用；key 相同的更新在下次批量执行前只保留最后一次
+        with self.updates_lock:
+            if key is None:
+                key = ('order', next(self.counter))
+            else:
+                self.updates.pop(key, None)  # 移到末尾，保证在此前的其他更新之后执行
+            self.updates[key] = (callback, args)
+
+    def flush_updates(self):
+        with self.updates_lock:
+            if not self.updates:
+                return
+            updates, self.updates = self.updates, OrderedDict()
+        for callback, args in updates.values():
+            try:
+                callback(*args)
+            except Exception:
+                traceback.print_exc()
@@ -0,0 +1,61 @@
+import itertools
+from git.request_scheduler import bucket_for
+
+
+class TokenPool:
+    # 把只读请求分散到所有已保存的 token 上，每次选剩余配额最多的一个；
+    # 声明了所需权限的写操作只在同一账号、且已知具备这些权限的 token 之间选择
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.tokens = []
+        self.scopes = {}  # token -> 响应头 X-OAuth-Scopes 中的权限集合
+        self.logins = {}  # token -> 登录成功后得到的账号名
+        self.disabled = set()  # 返回过 401 的 token
+        self.counter = itertools.count()
+
+    def set_tokens(self, tokens):
+        # 在 Qt 线程调用，整体替换列表，事件循环线程读到的总是完整的列表
+        self.tokens = list(tokens)
+        self.disabled = self.disabled & set(self.tokens)
+
+    def set_login(self, token, login):
+        self.logins[token] = login
+
+    def pick(self, resource, scopes=(), current=None):
+        # current 为调用方自己的 token；有权限要求时只考虑与它属于同一账号的 token，
+        # 账号未知时返回 None，调用方继续使用自己的 token
+        account = None
+        if scopes:
+            account = self.logins.get(current)
+            if account is None:
+                return None
+        candidates = [token for token in self.tokens
+                      if token not in self.disabled and self.has_scopes(token, scopes)
+                      and (account is None or self.logins.get(token) == account)]
+        if not candidates:
+            return None
+        # 轮换起点，剩余配额相同时也能把请求分散开
+        offset = next(self.counter) % len(candidates)
+        candidates = candidates[offset:] + candidates[:offset]
+        return max(candidates, key=lambda token: self.remaining(resource, token))
+
+    def remaining(self, resource, token):
+        remaining = self.scheduler.remaining(bucket_for(resource, {'Authorization': f'token {token}'}))
+        return float('inf') if remaining is None else remaining  # 还没用过的 token 优先
+
+    def has_scopes(self, token, scopes):
+        if not scopes:
+            return True
+        known = self.scopes.get(token)
+        return known is not None and set(scopes) <= known
+
+    def update(self, token, status, headers):
+        if token not in self.tokens:
+            return
+        if status == 401:
+            self.disabled.add(token)
+            print(f"Token {token[:4]}...{token[-4:]} 已失效，不再从 token 池中使用")
+            return
+        if 'X-OAuth-Scopes' in headers:
+            self.scopes[token] = {scope.strip() for scope in headers['X-OAuth-Scopes'].split(',') if scope.strip()}
@@ -3,11 +3,10 @@ import site
 sys.path.extend(site.getsitepackages())
 
 import json
-import asyncio
 from PyQt6 import QtWidgets, QtCore
-import aiohttp
 import os
-from cryptography.fernet import Fernet
+from git.http_cache import http_cache
+from git.request_scheduler import PRIORITY_INTERACTIVE
 
 class TokenTab(QtWidgets.QWidget):
     token_updated = QtCore.pyqtSignal(str)  # 修改信号以传递当前选中的token
@@ -100,6 +99,8 @@ class TokenTab(QtWidgets.QWidget):
                 key = f.read()
             with open('encrypted_token.bin', 'rb') as f:
                 encrypted_token = f.read()
+            # cryptography 导入较慢，只在确实有保存的 token 时导入
+            from cryptography.fernet import Fernet
             fernet = Fernet(key)
             decrypted_token = fernet.decrypt(encrypted_token).decode()
             self.current_token = decrypted_token
@@ -108,6 +109,7 @@ class TokenTab(QtWidgets.QWidget):
             pass  # 保存的 token
 
     def save_token(self, token):
+        from cryptography.fernet import Fernet
         key = Fernet.generate_key()
         fernet = Fernet(key)
         encrypted_token = fernet.encrypt(token.encode())
@@ -130,10 +132,10 @@ class TokenTab(QtWidgets.QWidget):
                 self.main_window.log_message(f"添加新 token：{token[:4]}...{token[-4:]}")  # 修改这行
             else:
                 QtWidgets.QMessageBox.warning(self, "无效的令牌", "令牌长度应至少为8个字符。")
-                self.main_window.log_message("尝试添加无效的 token")  # 修改这行
+                self.main_window.log_message("尝试添加无效的 token", "WARNING")  # 修改这行
         elif token in self.tokens:
             QtWidgets.QMessageBox.warning(self, "重复的令牌", "此令牌已存在，请勿重复添加。")
-            self.main_window.log_message("尝试添加重复的 token")  # 修改这行
+            self.main_window.log_message("尝试添加重复的 token", "WARNING")  # 修改这行
 
     def remove_token(self, item):
         reply = QtWidgets.QMessageBox.question(self, '确认', '是否确定删除此token？',
@@ -161,37 +163,49 @@ class TokenTab(QtWidgets.QWidget):
             masked_token = f"{i+1}. " + token[:4] + '*' * (len(token) - 8) + token[-4:]
             self.token_list.addItem(masked_token)
         self.token_count_label.setText(f"当前token数量: {len(self.tokens)}")
+        # 所有保存的 token 都加入 token 池，用于分担只读请求
+        self.main_window.http_client.token_pool.set_tokens(self.tokens)
+        tokens = list(self.tokens)
+        self.main_window.tasks.submit(lambda: self.identify_tokens_async(tokens), kind='login')
 
     @QtCore.pyqtSlot(str)
     def login_async(self, token):
         print(f"login_async called with token: {token[:4]}...{token[-4:]}")  # 添加这行日志
-        asyncio.get_event_loop().call_soon_threadsafe(
-            lambda: asyncio.create_task(self.try_login_async(token))
-        )
+        self.main_window.tasks.submit(lambda: self.try_login_async(token), kind='login')
 
     async def try_login_async(self, token):
+        import aiohttp  # 在事件循环线程中导入，不阻塞界面启动
         headers = {'Authorization': f'token {token}'}
-        async with aiohttp.ClientSession() as session:
+        session = await self.main_window.http_client.get_session()
+        try:
+            response = await http_cache.get(session, 'https://api.github.com/user', headers=headers, timeout=10,
+                                           priority=PRIORITY_INTERACTIVE)
+            if response.status == 200:
+                user_data = response.data
+                username = user_data.get('login', 'Unknown')
+                self.current_username = username  # 添加这行
+                self.main_window.http_client.token_pool.set_login(token, username)
+                self.main_window.tasks.post(self.update_login_status, username, True)
+            else:
+                self.main_window.tasks.post(self.update_login_status, "", False)
+        except aiohttp.ClientError as e:
+            self.main_window.tasks.post(self.update_login_status, "", False)
+
+    async def identify_tokens_async(self, tokens):
+        # 查询每个 token 所属的账号，token 池只在同一账号的 token 之间分配需要权限的写操作
+        import aiohttp
+        pool = self.main_window.http_client.token_pool
+        session = await self.main_window.http_client.get_session()
+        for token in tokens:
+            if token in pool.logins:
+                continue
             try:
-                async with session.get('https://api.github.com/user', headers=headers, timeout=10) as response:
-                    if response.status == 200:
-                        user_data = await response.json()
-                        username = user_data.get('login', 'Unknown')
-                        self.current_username = username  # 添加这行
-                        QtCore.QMetaObject.invokeMethod(self, "update_login_status", 
-                                                        QtCore.Qt.ConnectionType.QueuedConnection,
-                                                        QtCore.Q_ARG(str, username), 
-                                                        QtCore.Q_ARG(bool, True))
-                    else:
-                        QtCore.QMetaObject.invokeMethod(self, "update_login_status", 
-                                                        QtCore.Qt.ConnectionType.QueuedConnection,
-                                                        QtCore.Q_ARG(str, ""), 
-                                                        QtCore.Q_ARG(bool, False))
-            except aiohttp.ClientError as e:
-                QtCore.QMetaObject.invokeMethod(self, "update_login_status", 
-                                                QtCore.Qt.ConnectionType.QueuedConnection,
-                                                QtCore.Q_ARG(str, ""), 
-                                                QtCore.Q_ARG(bool, False))
+                response = await http_cache.get(session, 'https://api.github.com/user',
+                                                headers={'Authorization': f'token {token}'}, timeout=10)
+            except aiohttp.ClientError:
+                continue
+            if response.status == 200 and isinstance(response.data, dict):
+                pool.set_login(token, response.data.get('login'))
 
     @QtCore.pyqtSlot(str, bool)
     def update_login_status(self, username, success):
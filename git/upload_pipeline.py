@@ -0,0 +1,137 @@
+import asyncio
+import os
+import time
+
+
+class UploadPipeline:
+    # 扫描线程产出文件，N 个 worker 并发上传；遇到限流时所有 worker 一起暂停
+
+    RATE_LIMIT_STATUSES = (403, 429)
+    CONFLICT_STATUS = 409  # contents API 并发提交到同一分支时可能冲突，稍后重试即可
+
+    def __init__(self, worker_count=4, max_retries=5, base_delay=1.0, max_delay=60.0, on_progress=None):
+        self.worker_count = max(1, worker_count)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.on_progress = on_progress
+        self.resume_at = 0.0
+        self.total_files = 0
+        self.total_bytes = 0
+        self.done_files = 0
+        self.done_bytes = 0
+        self.skipped_files = 0
+        self.scan_finished = False
+        self.failed = []
+
+    async def run(self, items, handler):
+        # items: 产出 (本地路径, 仓库内路径) 的可迭代对象
+        # handler(本地路径, 仓库内路径) 返回 (状态码, 响应头)，状态码为 None 表示无需上传而跳过
+        queue = asyncio.Queue(maxsize=self.worker_count * 2)
+        workers = [asyncio.create_task(self.worker(queue, handler)) for _ in range(self.worker_count)]
+        try:
+            for file_path, github_path in items:
+                size = self.file_size(file_path)
+                self.total_files += 1
+                self.total_bytes += size
+                await queue.put((file_path, github_path, size))
+            self.scan_finished = True
+            self.report_progress()
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return self.failed
+
+    async def worker(self, queue, handler):
+        while True:
+            file_path, github_path, size = await queue.get()
+            try:
+                error = await self.upload_with_retry(handler, file_path, github_path)
+                if error:
+                    self.failed.append((github_path, error))
+                self.done_files += 1
+                self.done_bytes += size
+                self.report_progress()
+            finally:
+                queue.task_done()
+
+    async def upload_with_retry(self, handler, file_path, github_path):
+        # 成功返回 None，否则返回错误描述
+        for attempt in range(self.max_retries + 1):
+            await self.wait_for_resume()
+            try:
+                status, headers = await handler(file_path, github_path)
+            except Exception as e:
+                return str(e)
+
+            if status is None:
+                self.skipped_files += 1
+                return None
+            if 200 <= status < 300:
+                return None
+            if attempt == self.max_retries:
+                break
+            if status == self.CONFLICT_STATUS:
+                await asyncio.sleep(self.backoff_delay(attempt))
+            elif status in self.RATE_LIMIT_STATUSES and self.is_rate_limited(status, headers):
+                self.pause(self.rate_limit_delay(headers, attempt))
+            else:
+                return f"状态码 {status}"
+        return f"重试 {self.max_retries} 次后仍失败，状态码 {status}"
+
+    async def wait_for_resume(self):
+        delay = self.resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, delay):
+        resume_at = time.monotonic() + delay
+        if resume_at > self.resume_at:
+            print(f"触发 GitHub 限流，所有上传暂停 {delay:.0f} 秒")
+            self.resume_at = resume_at
+
+    @staticmethod
+    def is_rate_limited(status, headers):
+        if status == 429:
+            return True
+        headers = headers or {}
+        return 'Retry-After' in headers or headers.get('X-RateLimit-Remaining') == '0'
+
+    def rate_limit_delay(self, headers, attempt):
+        headers = headers or {}
+        if 'Retry-After' in headers:
+            try:
+                return float(headers['Retry-After'])
+            except ValueError:
+                pass
+        if headers.get('X-RateLimit-Remaining') == '0' and 'X-RateLimit-Reset' in headers:
+            try:
+                return max(float(headers['X-RateLimit-Reset']) - time.time(), 0) + 1
+            except ValueError:
+                pass
+        return self.backoff_delay(attempt)
+
+    def backoff_delay(self, attempt):
+        return min(self.base_delay * (2 ** attempt), self.max_delay)
+
+    @staticmethod
+    def file_size(file_path):
+        if file_path is None:
+            return 0
+        try:
+            return os.path.getsize(file_path)
+        except OSError:
+            return 0
+
+    def report_progress(self):
+        if self.on_progress:
+            self.on_progress(self)
+
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
@@ -0,0 +1,89 @@
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from PyQt6 import QtCore
+
+QT_THREAD = "Qt 界面线程"
+ASYNCIO_THREAD = "asyncio 线程"
+
+
+class LoopWatchdog(QtCore.QObject):
+    # 两个事件循环各自定时打卡；后台线程发现某个循环超过 threshold 秒没有打卡时，
+    # 持续采样该线程的调用栈，卡顿结束后报告持续时间和出现最多的调用栈
+    stall_detected = QtCore.pyqtSignal(str)
+
+    def __init__(self, threshold=0.25, interval=0.05, stack_limit=20, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold
+        self.interval = interval
+        self.stack_limit = stack_limit
+        self.beats = {}   # 循环名称 -> (最后一次打卡时间, 线程 id)
+        self.stalls = {}  # 循环名称 -> {'beat': 卡住时的打卡时间, 'samples': 调用栈计数}
+        self.max_lag = {}
+        self.stall_count = {}
+        self.running = False
+        self.qt_timer = None
+        self.thread = None
+
+    def start(self, loop=None):
+        # 必须在 Qt 线程中调用
+        self.running = True
+        self.beat(QT_THREAD)
+        self.qt_timer = QtCore.QTimer(self)
+        self.qt_timer.setInterval(int(self.interval * 1000))
+        self.qt_timer.timeout.connect(lambda: self.beat(QT_THREAD))
+        self.qt_timer.start()
+        if loop is not None:
+            self.watch_loop(loop)
+        self.thread = threading.Thread(target=self.run, name='loop-watchdog', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.qt_timer is not None:
+            self.qt_timer.stop()
+
+    def watch_loop(self, loop):
+        def tick():
+            self.beat(ASYNCIO_THREAD)
+            if self.running:
+                loop.call_later(self.interval, tick)
+
+        loop.call_soon_threadsafe(tick)
+
+    def beat(self, name):
+        self.beats[name] = (time.monotonic(), threading.get_ident())
+
+    def run(self):
+        while self.running:
+            time.sleep(self.interval)
+            now = time.monotonic()
+            for name, (last, ident) in list(self.beats.items()):
+                stall = self.stalls.get(name)
+                if stall is not None and last != stall['beat']:
+                    # 又打卡了，说明卡顿已经结束
+                    del self.stalls[name]
+                    self.report(name, last - stall['beat'] - self.interval, stall['samples'])
+                    stall = None
+
+                lag = now - last - self.interval
+                self.max_lag[name] = max(self.max_lag.get(name, 0.0), lag)
+                if lag < self.threshold:
+                    continue
+                if stall is None:
+                    stall = self.stalls[name] = {'beat': last, 'samples': Counter()}
+                frame = sys._current_frames().get(ident)
+                if frame is not None:
+                    stack = ''.join(traceback.format_stack(frame, limit=self.stack_limit))
+                    stall['samples'][stack] += 1
+
+    def report(self, name, duration, samples):
+        self.stall_count[name] = self.stall_count.get(name, 0) + 1
+        text = f"{name} 卡顿 {duration * 1000:.0f} ms"
+        if samples:
+            stack, count = samples.most_common(1)[0]
+            text += f"，采样 {sum(samples.values())} 次，其中 {count} 次停在:\n{stack.rstrip()}"
+        print(text)
+        self.stall_detected.emit(text)
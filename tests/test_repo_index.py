@@ -0,0 +1,126 @@
+import random
+import unittest
+
+from git.repo_index import RepoSearchIndex
+
+try:
+    from git.search_widget import SearchWidget
+except ImportError:  # 没有安装 PyQt6 时只和下面的逐个比较实现对照
+    SearchWidget = None
+
+SEARCH_OPTIONS = ("全部", "名称", "描述", "语言")
+FIELDS = {"全部": ('name', 'description', 'language'), "名称": ('name',), "描述": ('description',), "语言": ('language',)}
+
+
+def naive_filter(repos, search_text, search_option):
+    # 与 SearchWidget.filter_repos 相同的逐个比较：先精确匹配，再部分匹配，各自保持原顺序
+    search_text = search_text.lower()
+    exact, partial = set(), set()
+    for repo in repos:
+        for field in FIELDS[search_option]:
+            value = repo[field]
+            if value is None:
+                continue
+            if search_text == value.lower():
+                exact.add(repo['id'])
+            elif search_text in value.lower():
+                partial.add(repo['id'])
+    partial -= exact
+    return ([repo for repo in repos if repo['id'] in exact] +
+            [repo for repo in repos if repo['id'] in partial])
+
+
+def random_text(rng, length):
+    return ''.join(rng.choice('abcAB-_1 ') for _ in range(length))
+
+
+def make_repos(rng, count, start_id=0):
+    repos = []
+    for repo_id in range(start_id, start_id + count):
+        repos.append({
+            'id': repo_id,
+            'name': random_text(rng, rng.randint(1, 8)),
+            'description': rng.choice([None, '', random_text(rng, rng.randint(1, 20))]),
+            'language': rng.choice([None, 'Python', 'Go', 'C', 'C++', 'JavaScript']),
+        })
+    return repos
+
+
+def make_queries(rng, repos):
+    queries = ['', 'a', 'A', 'ab', 'abc', 'python', 'c', 'c++', 'go', 'zzz', ' ']
+    for repo in rng.sample(repos, 20):
+        value = repo['name']
+        start = rng.randint(0, len(value) - 1)
+        queries.append(value[start:start + rng.randint(1, 4)])
+        queries.append(value)
+    return queries
+
+
+class RepoSearchIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(1234)
+        self.repos = make_repos(self.rng, 500)
+
+    def assert_same_results(self, index, repos, queries):
+        for query in queries:
+            for option in SEARCH_OPTIONS:
+                expected = [repo['id'] for repo in naive_filter(repos, query, option)]
+                actual = [repo['id'] for repo in index.filter_repos(query, option)]
+                self.assertEqual(actual, expected, f"查询 {query!r}，选项 {option}")
+
+    def test_matches_naive_filter(self):
+        index = RepoSearchIndex(self.repos)
+        self.assert_same_results(index, self.repos, make_queries(self.rng, self.repos))
+
+    @unittest.skipIf(SearchWidget is None, "需要 PyQt6")
+    def test_matches_search_widget(self):
+        index = RepoSearchIndex(self.repos)
+        for query in make_queries(self.rng, self.repos):
+            for option in SEARCH_OPTIONS:
+                expected = [repo['id'] for repo in SearchWidget.filter_repos(self.repos, query, option)]
+                actual = [repo['id'] for repo in index.filter_repos(query, option)]
+                self.assertEqual(actual, expected, f"查询 {query!r}，选项 {option}")
+
+    def test_incremental_updates(self):
+        # 增删改之后的结果应与对新列表重建索引一致
+        repos = list(self.repos)
+        index = RepoSearchIndex(repos)
+
+        added = make_repos(self.rng, 50, start_id=1000)
+        index.add_repos(added)
+        repos.extend(added)
+
+        removed = {repo['id'] for repo in self.rng.sample(repos, 60)}
+        for repo_id in removed:
+            index.remove_repo(repo_id)
+        repos = [repo for repo in repos if repo['id'] not in removed]
+
+        for position in self.rng.sample(range(len(repos)), 40):
+            updated = dict(repos[position], name=random_text(self.rng, 6), language='Rust')
+            index.update_repo(updated)
+            repos[position] = updated
+
+        self.assertEqual(len(index), len(repos))
+        self.assert_same_results(index, repos, make_queries(self.rng, repos) + ['rust'])
+
+    def test_copy_does_not_change_original(self):
+        index = RepoSearchIndex(self.repos)
+        queries = make_queries(self.rng, self.repos)
+        before = {(query, option): index.search(query, option) for query in queries for option in SEARCH_OPTIONS}
+
+        added = make_repos(self.rng, 30, start_id=2000)
+        updated = dict(self.repos[40], name='abc', description='abc')
+        copy = index.copy()
+        copy.add_repos(added)
+        for repo in self.repos[:30]:
+            copy.remove_repo(repo['id'])
+        copy.update_repo(updated)
+        repos = [updated if repo['id'] == updated['id'] else repo for repo in self.repos[30:]] + added
+        self.assert_same_results(copy, repos, queries + ['abc'])
+
+        for (query, option), ids in before.items():
+            self.assertEqual(index.search(query, option), ids, f"查询 {query!r}，选项 {option}")
+
+
+if __name__ == '__main__':
+    unittest.main()